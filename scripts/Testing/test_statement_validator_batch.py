@@ -0,0 +1,152 @@
+"""
+Batch Validator Consistency Test
+================================
+
+Checks that the array-based entry points of StatementValidator agree with
+the per-statement validators on the same filings:
+1. validate_all_statements_batch (record array of checked / passed flags)
+2. validate_from_dataframe (long frame of equation, valid, diff_pct)
+
+Inputs mix 0.0, None and NaN values, which must count as present, missing
+and missing respectively on both paths.
+"""
+
+import math
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+import pandas as pd
+
+from statement_validator import BATCH_EQUATIONS, StatementValidator, _EQUATIONS, _TAG_COLUMNS
+
+NAN = float('nan')
+
+# Batch field prefix of each equation name / failure label
+KEY_BY_NAME = {eq.name: eq.key for eq in _EQUATIONS}
+KEY_BY_LABEL = {eq.label: eq.key for eq in _EQUATIONS}
+
+
+def random_filings(n: int = 5000, seed: int = 0):
+    """Filings holding a random subset of the validator tags"""
+    rng = random.Random(seed)
+    filings = []
+    for _ in range(n):
+        base = rng.choice([100.0, 5000.0, 1e6, -3000.0])
+        filing = {}
+        for tag in _TAG_COLUMNS:
+            r = rng.random()
+            if r < 0.4:
+                continue
+            elif r < 0.5:
+                filing[tag] = 0.0
+            elif r < 0.6:
+                filing[tag] = None
+            elif r < 0.7:
+                filing[tag] = NAN
+            elif r < 0.9:
+                filing[tag] = base
+            else:
+                filing[tag] = rng.choice([base / 2, base * 2, base + 5000])
+        filings.append(filing)
+    return filings
+
+
+# Blank values must fall through to the next alias / alternative equation
+NAN_CASES = [
+    {'Assets': 1e6, 'LiabilitiesAndStockholdersEquity': NAN,
+     'Liabilities': 4e5, 'StockholdersEquity': 6e5},
+    {'Revenues': NAN, 'RevenueFromContractWithCustomerExcludingAssessedTax': 5e5,
+     'CostOfRevenue': 3e5, 'GrossProfit': 2e5},
+    {'Revenues': None, 'SalesRevenueNet': 5e5, 'CostOfSales': 3e5, 'GrossProfit': 2e5},
+]
+
+
+def scalar_expectations(validator: StatementValidator, filing: dict) -> dict:
+    """{batch key: (checked, passed, diff_pct or None)} plus '<stmt>_valid'"""
+    expected = {}
+    for stmt, result in validator.validate_all_statements(filing, filing, filing).items():
+        failed_pct = {KEY_BY_LABEL[error['equation']]: error.get('diff_pct', NAN)
+                      for error in result.equations_failed}
+        passed = set(result.equations_passed)
+        for name in result.equations_checked:
+            key = KEY_BY_NAME[name]
+            expected[key] = (True, name in passed, failed_pct.get(key))
+        expected[f'{stmt}_valid'] = result.valid
+    return expected
+
+
+def same_pct(a: float, b: float) -> bool:
+    return (math.isnan(a) and math.isnan(b)) or math.isclose(a, b)
+
+
+def test_nan_cases_pass():
+    """The blank-value examples validate on the scalar path"""
+    validator = StatementValidator()
+    for filing in NAN_CASES:
+        results = validator.validate_all_statements(filing, filing, filing)
+        stmt = 'BS' if 'Assets' in filing else 'IS'
+        assert results[stmt].valid, (filing, results[stmt].equations_failed)
+
+
+def test_batch_matches_scalar():
+    """validate_all_statements_batch flags == per-statement results"""
+    validator = StatementValidator()
+    filings = NAN_CASES + random_filings()
+    batch = validator.validate_all_statements_batch(filings)
+
+    mismatches = 0
+    for i, filing in enumerate(filings):
+        expected = scalar_expectations(validator, filing)
+        for stmt, key in BATCH_EQUATIONS:
+            checked, passed, _ = expected.get(key, (False, False, None))
+            if (bool(batch[f'{key}_checked'][i]), bool(batch[f'{key}_passed'][i])) != (checked, passed):
+                mismatches += 1
+        for stmt in ('BS', 'IS', 'CF'):
+            if bool(batch[f'{stmt}_valid'][i]) != expected[f'{stmt}_valid']:
+                mismatches += 1
+
+    print(f"  batch: {mismatches} mismatches over {len(filings)} filings")
+    assert mismatches == 0
+
+
+def test_dataframe_matches_scalar():
+    """validate_from_dataframe rows == per-statement results"""
+    validator = StatementValidator()
+    filings = NAN_CASES + random_filings(seed=1)
+    ids = [f'filing-{i}' for i in range(len(filings))]
+    frame = validator.validate_from_dataframe(pd.DataFrame.from_records(filings, index=ids))
+
+    rows = {}
+    for filing_id, row in zip(frame.index, frame.itertuples(index=False)):
+        rows.setdefault(filing_id, {})[row.equation] = (bool(row.valid), row.diff_pct)
+
+    mismatches = 0
+    for filing_id, filing in zip(ids, filings):
+        expected = {key: value for key, value in scalar_expectations(validator, filing).items()
+                    if not key.endswith('_valid')}
+        got = rows.get(filing_id, {})
+        if set(got) != set(expected):
+            mismatches += 1
+            continue
+        for key, (_, passed, diff_pct) in expected.items():
+            valid, got_pct = got[key]
+            if valid != passed or (diff_pct is not None and not same_pct(diff_pct, got_pct)):
+                mismatches += 1
+
+    print(f"  dataframe: {mismatches} mismatches over {len(filings)} filings")
+    assert mismatches == 0
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("BATCH VALIDATOR CONSISTENCY TEST")
+    print("=" * 80)
+
+    for test in (test_nan_cases_pass, test_batch_matches_scalar, test_dataframe_matches_scalar):
+        print(f"\n{test.__doc__}")
+        test()
+        print("  ✓ passed")
+
+    print("\n✓ All tests passed!")
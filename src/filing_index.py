@@ -8,6 +8,8 @@ Author: Finexus Team
 Date: November 2025
 """
 
+import csv
+import io
 import sys
 import pandas as pd
 import psycopg2
@@ -28,6 +30,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Columns written to the filings table, in record order
+FILING_COLUMNS = (
+    'adsh', 'cik', 'company_name', 'form_type', 'filed_date', 'period_end_date',
+    'fiscal_year', 'fiscal_period', 'sic', 'countryba', 'stprba', 'cityba', 'zipba', 'bas1',
+    'accepted_timestamp', 'prevrpt', 'detail', 'instance', 'nciks', 'aciks',
+    'source_year', 'source_quarter', 'source_dataset'
+)
+
+# Below this many filings a COPY round trip is not worth it (bulk mode)
+COPY_MIN_ROWS = 1024
+
 
 class FilingIndexer:
     """
@@ -122,7 +135,8 @@ class FilingIndexer:
         except Exception as e:
             logger.error(f"Error updating dataset status: {e}")
 
-    def index_quarter(self, year: int, quarter: int, force: bool = False) -> Dict:
+    def index_quarter(self, year: int, quarter: int, force: bool = False,
+                      bulk_mode: bool = False) -> Dict:
         """
         Index a single quarter's filings into database
 
@@ -130,6 +144,8 @@ class FilingIndexer:
             year: Year (e.g., 2024)
             quarter: Quarter (1-4)
             force: Force reindex even if already done
+            bulk_mode: Load filings with COPY through a staging table
+                       (for quarters with more than COPY_MIN_ROWS filings)
 
         Returns:
             Dict with indexing statistics
@@ -181,7 +197,7 @@ class FilingIndexer:
 
             # Index filings
             logger.info("Indexing filings...")
-            filings_stats = self._index_filings(sub_df, year, quarter)
+            filings_stats = self._index_filings(sub_df, year, quarter, bulk_mode=bulk_mode)
             result['filings_added'] = filings_stats['added']
 
             # Update dataset status - processing complete
@@ -281,7 +297,8 @@ class FilingIndexer:
         logger.info(f"   Companies: {stats['added']} added, {stats['updated']} updated")
         return stats
 
-    def _index_filings(self, sub_df: pd.DataFrame, year: int, quarter: int) -> Dict:
+    def _index_filings(self, sub_df: pd.DataFrame, year: int, quarter: int,
+                       bulk_mode: bool = False) -> Dict:
         """Index filings from sub.txt into filings table"""
         stats = {'added': 0, 'skipped': 0}
 
@@ -338,18 +355,21 @@ class FilingIndexer:
         logger.info(f"   Bulk inserting {len(filing_records):,} filings...")
 
         try:
-            execute_values(cursor, """
-                INSERT INTO filings (
-                    adsh, cik, company_name, form_type, filed_date, period_end_date,
-                    fiscal_year, fiscal_period, sic, countryba, stprba, cityba, zipba, bas1,
-                    accepted_timestamp, prevrpt, detail, instance, nciks, aciks,
-                    source_year, source_quarter, source_dataset
-                )
-                VALUES %s
-                ON CONFLICT (adsh) DO NOTHING
-            """, filing_records)
-
-            stats['added'] = cursor.rowcount
+            if bulk_mode and len(filing_records) > COPY_MIN_ROWS:
+                stats['added'] = self._copy_filings(cursor, filing_records)
+            else:
+                execute_values(cursor, """
+                    INSERT INTO filings (
+                        adsh, cik, company_name, form_type, filed_date, period_end_date,
+                        fiscal_year, fiscal_period, sic, countryba, stprba, cityba, zipba, bas1,
+                        accepted_timestamp, prevrpt, detail, instance, nciks, aciks,
+                        source_year, source_quarter, source_dataset
+                    )
+                    VALUES %s
+                    ON CONFLICT (adsh) DO NOTHING
+                """, filing_records)
+                stats['added'] = cursor.rowcount
+
             conn.commit()
 
         except Exception as e:
@@ -363,6 +383,49 @@ class FilingIndexer:
         logger.info(f"   Filings: {stats['added']} added")
         return stats
 
+    @staticmethod
+    def _copy_value(value):
+        """Filing record value as a COPY CSV field (None -> NULL)"""
+        if value is None:
+            return None
+        if isinstance(value, float) and pd.isna(value):
+            return None
+        if isinstance(value, list):
+            # text[] literal
+            return '{' + ','.join('"' + str(v).replace('\\', '\\\\').replace('"', '\\"') + '"'
+                                  for v in value) + '}'
+        return value
+
+    def _copy_filings(self, cursor, filing_records: List[tuple]) -> int:
+        """
+        Load filing records with COPY FROM STDIN
+
+        Rows are streamed as CSV into a temporary staging table (session
+        local and unlogged, dropped on commit), then moved into filings with
+        ON CONFLICT (adsh) DO NOTHING, as the execute_values path does.
+
+        Returns:
+            Number of filings inserted
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in filing_records:
+            writer.writerow([self._copy_value(value) for value in record])
+        buffer.seek(0)
+
+        columns = ', '.join(FILING_COLUMNS)
+        cursor.execute("""
+            CREATE TEMP TABLE filings_stage (LIKE filings INCLUDING DEFAULTS)
+            ON COMMIT DROP
+        """)
+        cursor.copy_expert(f"COPY filings_stage ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(f"""
+            INSERT INTO filings ({columns})
+            SELECT {columns} FROM filings_stage
+            ON CONFLICT (adsh) DO NOTHING
+        """)
+        return cursor.rowcount
+
     def index_range(self, start_year: int, start_quarter: int,
                    end_year: int, end_quarter: int) -> List[Dict]:
         """Index a range of quarters"""
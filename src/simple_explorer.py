@@ -2,7 +2,7 @@
 SEC NUM+SUB Simple Explorer
 ===========================
 Simple exploration script that merges NUM and SUB tables 
-and outputs CSV/Excel files for manual analysis.
+and outputs Parquet/CSV/Excel files for manual analysis.
 No filtering - we want to see EVERYTHING.
 
 Author: Faliang
@@ -10,11 +10,15 @@ Date: November 2025
 """
 
 import os
+import gc
 import requests
 import zipfile
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from config import StorageConfig
 
@@ -25,23 +29,44 @@ class SimpleDataExplorer:
     """
     Simple explorer that merges NUM and SUB data and outputs files
     """
+
+    # Number of output files serialized concurrently
+    OUTPUT_WRITERS = 4
+
+    # Copy buffer for the ZIP download (1 MiB)
+    DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+    # SUB columns merged onto NUM (the only SUB columns we read)
+    SUB_COLUMNS = ['adsh', 'cik', 'name', 'sic', 'form', 'filed', 'period', 'fy', 'fp']
     
-    def __init__(self, year: int = 2024, quarter: int = 2):
+    def __init__(self, year: int = 2024, quarter: int = 2, debug: bool = None):
         self.year = year
         self.quarter = quarter
 
+        # Debug previews of the raw SUB/NUM tables (off unless EDGAR_DEBUG is set)
+        self.debug = debug if debug is not None else bool(os.environ.get('EDGAR_DEBUG'))
+
          # Use StorageConfig
         storage = StorageConfig()
         storage.create_directories()
 
         self.base_dir = storage.extracted_dir / f'{year}q{quarter}'
         self.base_dir.mkdir(parents=True, exist_ok=True)
+
+        # Parsed SUB/NUM snapshots reused across runs. Kept apart from the
+        # dataset files because NUM may be truncated for exploration.
+        self.cache_dir = self.base_dir / 'explorer_cache'
         
         self.zip_file = f"{year}q{quarter}.zip"
         self.url = f"https://www.sec.gov/files/dera/data/financial-statement-data-sets/{self.zip_file}"
         
     def download_and_extract(self):
-        """Download and extract the ZIP file"""
+        """
+        Download the ZIP file
+
+        Nothing is extracted to disk: sub.txt and num.txt are streamed
+        straight out of the archive when they are loaded.
+        """
         zip_path = self.base_dir / self.zip_file
         
         # Download if needed
@@ -49,20 +74,90 @@ class SimpleDataExplorer:
             logger.info(f"Downloading {self.zip_file}...")
             headers = {'User-Agent': 'Data Explorer (your.email@example.com)'}
             
-            response = requests.get(self.url, headers=headers, stream=True)
-            response.raise_for_status()
-            
-            with open(zip_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with requests.Session() as session:
+                session.headers.update(headers)
+                with session.get(self.url, stream=True) as response:
+                    response.raise_for_status()
+                    # The ZIP is copied byte-for-byte: no content decoding, and
+                    # reads land in one reused buffer instead of fresh chunks
+                    response.raw.decode_content = False
+                    buffer = memoryview(bytearray(self.DOWNLOAD_CHUNK_SIZE))
+                    with open(zip_path, 'wb') as f:
+                        while True:
+                            n = response.raw.readinto(buffer)
+                            if not n:
+                                break
+                            f.write(buffer[:n])
             
             logger.info("Download complete")
-        
-        # Extract all files
-        logger.info("Extracting all files...")
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(self.base_dir)
-        logger.info("Extraction complete")
+
+    def _table_size_mb(self, name: str) -> float:
+        """Uncompressed size of a dataset table (extracted file or ZIP member)"""
+        txt_path = self.base_dir / name
+        if txt_path.exists():
+            return os.path.getsize(txt_path) / (1024 * 1024)
+        with zipfile.ZipFile(self.base_dir / self.zip_file, 'r') as zip_ref:
+            return zip_ref.getinfo(name).file_size / (1024 * 1024)
+
+    def _read_table(self, name: str, **read_kwargs) -> pd.DataFrame:
+        """
+        Read a tab-delimited dataset table
+
+        Uses the extracted file if a previous run left one in base_dir,
+        otherwise streams the member directly out of the ZIP.
+        """
+        txt_path = self.base_dir / name
+        if txt_path.exists():
+            return pd.read_csv(txt_path, sep='\t', **read_kwargs)
+        with zipfile.ZipFile(self.base_dir / self.zip_file, 'r') as zip_ref:
+            with zip_ref.open(name) as f:
+                return pd.read_csv(f, sep='\t', **read_kwargs)
+
+    def _load_cached(self, name: str, parse) -> pd.DataFrame:
+        """
+        Load a parsed table from the Parquet cache
+
+        On the first run the table is parsed with parse() and written to
+        cache_dir/{name}.parquet; later runs skip the TSV parse entirely.
+        """
+        cache_path = self.cache_dir / f'{name}.parquet'
+        if cache_path.exists():
+            logger.info(f"Reading cached {cache_path.name}")
+            return pd.read_parquet(cache_path)
+
+        df = parse()
+        self.cache_dir.mkdir(exist_ok=True)
+        df.to_parquet(cache_path, compression='zstd', row_group_size=500_000, index=False)
+        logger.info(f"Cached {cache_path.name}")
+        return df
+
+    def _parse_num(self) -> pd.DataFrame:
+        """Parse num.txt, limited to the first 1M rows for very large quarters"""
+        # First, check the size
+        file_size_mb = self._table_size_mb('num.txt')
+        logger.info(f"NUM file size: {file_size_mb:.1f} MB")
+
+        # Load in chunks if file is large
+        if file_size_mb > 500:
+            logger.info("Large file detected, loading first 1 million rows for exploration...")
+            return self._read_table('num.txt', nrows=1000000, low_memory=False)
+
+        # Full table: parse with pyarrow's multithreaded native reader
+        # (the pyarrow engine cannot stop after nrows, hence the split)
+        return self._read_table('num.txt', engine='pyarrow')
+
+    def _write_outputs(self, pending_writes):
+        """
+        Run queued output writes concurrently
+
+        Args:
+            pending_writes: List of (filename, write callable) tuples
+        """
+        with ThreadPoolExecutor(max_workers=self.OUTPUT_WRITERS) as executor:
+            futures = [(filename, executor.submit(write)) for filename, write in pending_writes]
+            for filename, future in futures:
+                future.result()
+                logger.info(f"Saved {filename}")
         
     def explore_and_merge(self):
         """Load, merge, and explore the data"""
@@ -72,56 +167,60 @@ class SimpleDataExplorer:
         
         # ===== STEP 1: Load SUB table (company info) =====
         logger.info("Loading SUB table...")
-        sub_file = self.base_dir / 'sub.txt'
-        sub_df = pd.read_csv(sub_file, sep='\t', low_memory=False)
+        sub_df = self._load_cached('sub', lambda: self._read_table(
+            'sub.txt',
+            usecols=lambda col: col in self.SUB_COLUMNS,
+            low_memory=False
+        ))
         logger.info(f"SUB loaded: {len(sub_df):,} rows, {len(sub_df.columns)} columns")
         logger.info(f"SUB columns: {list(sub_df.columns)}")
         
-        # Save SUB sample
-        sub_df.head(1000).to_csv(output_dir / 'sub_sample.csv', index=False)
-        logger.info("Saved sub_sample.csv")
+        # Save SUB sample (debug only)
+        if self.debug:
+            sub_df.head(1000).to_csv(
+                output_dir / 'sub_sample.csv.gz', index=False, compression='gzip', chunksize=10000
+            )
+            logger.info("Saved sub_sample.csv.gz")
         
         # ===== STEP 2: Load NUM table (numerical data) =====
         logger.info("Loading NUM table (this may take a minute)...")
-        num_file = self.base_dir / 'num.txt'
-        
-        # First, check the size
-        file_size_mb = os.path.getsize(num_file) / (1024 * 1024)
-        logger.info(f"NUM file size: {file_size_mb:.1f} MB")
-        
-        # Load in chunks if file is large
-        if file_size_mb > 500:
-            logger.info("Large file detected, loading first 1 million rows for exploration...")
-            num_df = pd.read_csv(num_file, sep='\t', nrows=1000000, low_memory=False)
-        else:
-            num_df = pd.read_csv(num_file, sep='\t', low_memory=False)
+        num_df = self._load_cached('num', self._parse_num)
             
         logger.info(f"NUM loaded: {len(num_df):,} rows, {len(num_df.columns)} columns")
         logger.info(f"NUM columns: {list(num_df.columns)}")
         
-        # Save NUM sample (before merge)
-        num_df.head(1000).to_csv(output_dir / 'num_sample_before_merge.csv', index=False)
-        logger.info("Saved num_sample_before_merge.csv")
+        # Save NUM sample before merge (debug only)
+        if self.debug:
+            num_df.head(1000).to_csv(
+                output_dir / 'num_sample_before_merge.csv.gz', index=False, compression='gzip', chunksize=10000
+            )
+            logger.info("Saved num_sample_before_merge.csv.gz")
         
         # ===== STEP 3: Merge NUM with SUB =====
         logger.info("Merging NUM with SUB data...")
         
-        # Select key columns from SUB to merge
+        # Key columns from SUB to merge
         # You're right - left merge adds SUB columns to NUM dataframe
-        sub_columns_to_merge = ['adsh', 'cik', 'name', 'sic', 'form', 'filed', 'period', 'fy', 'fp']
-        
         # Make sure we only use columns that exist
-        available_columns = [col for col in sub_columns_to_merge if col in sub_df.columns]
+        available_columns = [col for col in self.SUB_COLUMNS if col in sub_df.columns]
         logger.info(f"Merging these SUB columns: {available_columns}")
         
-        # Left merge: keeps all NUM records, adds SUB info where available
-        merged_df = pd.merge(
-            num_df,
-            sub_df[available_columns],
-            on='adsh',
-            how='left',
-            suffixes=('', '_from_sub')  # In case of column name conflicts
-        )
+        # Left merge: keeps all NUM records, adds SUB info where available.
+        # Done as one adsh lookup plus column assignment so NUM's existing
+        # columns are reused as-is; only the SUB columns are allocated.
+        sub_lookup = sub_df[available_columns].drop_duplicates('adsh').set_index('adsh')
+        sub_matched = sub_lookup.reindex(num_df['adsh'])
+        merged_df = num_df
+        for col in sub_lookup.columns:
+            # In case of column name conflicts
+            target = f'{col}_from_sub' if col in merged_df.columns else col
+            merged_df[target] = sub_matched[col].to_numpy()
+
+        # Inputs are no longer needed; keep their row counts for the summary
+        # and release them so they don't double peak memory for the rest of the run
+        num_rows, sub_rows = len(num_df), len(sub_df)
+        del num_df, sub_df
+        gc.collect()
         
         logger.info(f"Merged data: {len(merged_df):,} rows, {len(merged_df.columns)} columns")
         logger.info(f"Merged columns: {list(merged_df.columns)}")
@@ -131,12 +230,16 @@ class SimpleDataExplorer:
         logger.info(f"Records with CIK: {len(merged_df) - missing_cik:,}")
         logger.info(f"Records missing CIK: {missing_cik:,}")
         
+        # Output files from steps 4-5 are queued here and written in parallel
+        pending_writes = []
+
         # ===== STEP 4: Analyze all tags (no filtering!) =====
         logger.info("Analyzing ALL tags in the dataset...")
         
-        # Get tag frequency
-        tag_counts = merged_df['tag'].value_counts()
+        # Get tag frequency and the dataset-level counts in one pass each
+        tag_counts = merged_df['tag'].value_counts(sort=True)
         logger.info(f"Total unique tags: {len(tag_counts):,}")
+        stats = merged_df.agg({'cik': 'nunique', 'adsh': 'nunique', 'name': 'count'})
         
         # Save tag analysis
         tag_analysis = pd.DataFrame({
@@ -144,42 +247,59 @@ class SimpleDataExplorer:
             'count': tag_counts.values,
             'percentage': (tag_counts.values / len(merged_df)) * 100
         })
-        tag_analysis.to_csv(output_dir / 'all_tags_frequency.csv', index=False)
-        tag_analysis.head(500).to_excel(output_dir / 'top_500_tags.xlsx', index=False)
-        logger.info("Saved all_tags_frequency.csv and top_500_tags.xlsx")
+        pending_writes.append(('all_tags_frequency.parquet', partial(
+            tag_analysis.to_parquet, output_dir / 'all_tags_frequency.parquet',
+            compression='snappy', index=False
+        )))
+        pending_writes.append(('top_500_tags.xlsx', partial(
+            tag_analysis.head(500).to_excel, output_dir / 'top_500_tags.xlsx',
+            index=False, engine='xlsxwriter'
+        )))
         
         # ===== STEP 5: Create various exploratory outputs =====
         
         # 1. General sample with company info
         logger.info("Creating general merged sample...")
         merged_sample = merged_df.head(10000)
-        merged_sample.to_csv(output_dir / 'merged_sample.csv', index=False)
-        merged_sample.head(5000).to_excel(output_dir / 'merged_sample.xlsx', index=False)
-        logger.info("Saved merged_sample.csv and .xlsx")
+        pending_writes.append(('merged_sample.parquet', partial(
+            merged_sample.to_parquet, output_dir / 'merged_sample.parquet',
+            compression='snappy', index=False
+        )))
+        pending_writes.append(('merged_sample.xlsx', partial(
+            merged_sample.head(5000).to_excel, output_dir / 'merged_sample.xlsx', index=False
+        )))
         
         # 2. Group by company to see what each company reports
         logger.info("Creating company tag summary...")
-        company_tags = merged_df.groupby(['cik', 'name'])['tag'].agg(['count', 'nunique']).reset_index()
-        company_tags.columns = ['cik', 'name', 'total_records', 'unique_tags']
-        company_tags = company_tags.sort_values('total_records', ascending=False)
-        company_tags.head(1000).to_csv(output_dir / 'company_tag_summary.csv', index=False)
-        company_tags.head(500).to_excel(output_dir / 'company_tag_summary.xlsx', index=False)
-        logger.info("Saved company_tag_summary files")
+        company_tags = merged_df.groupby('cik', sort=False).agg(
+            name=('name', 'first'),
+            total_records=('tag', 'size'),
+            unique_tags=('tag', 'nunique')
+        ).reset_index()
+        company_tags = company_tags.sort_values('total_records', ascending=False, kind='stable')
+        pending_writes.append(('company_tag_summary.csv', partial(
+            company_tags.head(1000).to_csv, output_dir / 'company_tag_summary.csv', index=False
+        )))
+        pending_writes.append(('company_tag_summary.xlsx', partial(
+            company_tags.head(500).to_excel, output_dir / 'company_tag_summary.xlsx', index=False
+        )))
         
         # 3. Random sample of different tags with values
         logger.info("Creating tag value samples...")
         # Get 100 random tags
         sample_tags = tag_counts.head(100).index
-        tag_samples = []
-        for tag in sample_tags:
-            tag_data = merged_df[merged_df['tag'] == tag].head(10)
-            if len(tag_data) > 0:
-                tag_samples.append(tag_data)
-        
+
+        # Collect the first 10 row positions per tag, then gather them in one iloc
+        sample_rows = np.flatnonzero(merged_df['tag'].isin(sample_tags).to_numpy())
+        sample_row_tags = merged_df['tag'].iloc[sample_rows]
+        rows_by_tag = sample_row_tags.groupby(sample_row_tags, sort=False).indices
+        tag_samples = [sample_rows[rows_by_tag[tag][:10]] for tag in sample_tags if tag in rows_by_tag]
+
         if tag_samples:
-            tag_sample_df = pd.concat(tag_samples, ignore_index=True)
-            tag_sample_df.to_csv(output_dir / 'tag_value_samples.csv', index=False)
-            logger.info("Saved tag_value_samples.csv")
+            tag_sample_df = merged_df.iloc[np.concatenate(tag_samples)].reset_index(drop=True)
+            pending_writes.append(('tag_value_samples.csv', partial(
+                tag_sample_df.to_csv, output_dir / 'tag_value_samples.csv', index=False
+            )))
         
         # 4. Company-specific extracts for manual review
         logger.info("Creating company-specific extracts...")
@@ -193,8 +313,9 @@ class SimpleDataExplorer:
             company_data = merged_df[merged_df['cik'] == company_cik].head(1000)
             if len(company_data) > 0:
                 filename = f'company_{company_cik}_{company_name}.csv'
-                company_data.to_csv(output_dir / filename, index=False)
-                logger.info(f"Saved {filename}")
+                pending_writes.append((filename, partial(
+                    company_data.to_csv, output_dir / filename, index=False
+                )))
         
         # 5. Pivot table showing companies vs tags (small sample)
         logger.info("Creating company-tag pivot sample...")
@@ -209,27 +330,33 @@ class SimpleDataExplorer:
         ]
         
         if len(pivot_data) > 0:
-            pivot_table = pivot_data.pivot_table(
-                index=['cik', 'name'],
-                columns='tag',
-                values='value',
-                aggfunc='first'  # Just take first value for now
+            # groupby().first() + unstack is what pivot_table(aggfunc='first')
+            # does, minus pivot_table's generic dispatch
+            pivot_table = (
+                pivot_data.groupby(['cik', 'name', 'tag'])['value']
+                .first()  # Just take first value for now
+                .unstack('tag')
+                .dropna(axis=1, how='all')
             )
-            pivot_table.to_csv(output_dir / 'company_tag_pivot.csv')
-            logger.info("Saved company_tag_pivot.csv")
+            pending_writes.append(('company_tag_pivot.csv', partial(
+                pivot_table.to_csv, output_dir / 'company_tag_pivot.csv'
+            )))
+
+        logger.info(f"Writing {len(pending_writes)} output files...")
+        self._write_outputs(pending_writes)
         
         # ===== STEP 6: Create summary statistics =====
         logger.info("Creating summary statistics...")
         
         summary = {
             'Dataset': f'{self.year}Q{self.quarter}',
-            'NUM Records': len(num_df),
-            'SUB Records': len(sub_df),
+            'NUM Records': num_rows,
+            'SUB Records': sub_rows,
             'Merged Records': len(merged_df),
             'Unique Tags': len(tag_counts),
-            'Unique Companies (CIK)': merged_df['cik'].nunique(),
-            'Unique Submissions (adsh)': merged_df['adsh'].nunique(),
-            'Records with company name': len(merged_df) - merged_df['name'].isna().sum(),
+            'Unique Companies (CIK)': stats['cik'],
+            'Unique Submissions (adsh)': stats['adsh'],
+            'Records with company name': stats['name'],
             'File generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         
@@ -273,12 +400,12 @@ def main():
     print("FILES TO REVIEW")
     print("="*60)
     print("1. merged_sample.xlsx - General sample with company names")
-    print("2. all_tags_frequency.csv - ALL tags and their frequencies")
+    print("2. all_tags_frequency.parquet - ALL tags and their frequencies (top 500 in top_500_tags.xlsx)")
     print("3. company_tag_summary.xlsx - What each company reports")
     print("4. tag_value_samples.csv - Sample values for different tags")
     print("5. company_*.csv - Specific company data")
     print("6. company_tag_pivot.csv - Pivot table of companies vs tags")
-    print("\nOpen these files in Excel to explore the actual data structure!")
+    print("\nOpen the .xlsx/.csv files in Excel; load the .parquet files with pd.read_parquet()")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
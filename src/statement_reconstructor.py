@@ -17,16 +17,231 @@ Author: Generated with Claude Code
 Date: 2025-11-10
 """
 
+import functools
+import logging
+import multiprocessing
+import os
+import sys
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from pyarrow import dataset as pa_ds
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
+from bisect import bisect_left
 from datetime import datetime
 from sqlalchemy import create_engine, text
 from config import config
+from period_discovery import PeriodDiscovery
+from xbrl_loader import load_calc_graph_with_fallback
+
+logger = logging.getLogger(__name__)
+
+# Banner line around each reconstruction's progress output
+_RULE = '=' * 60
+
+
+# Columns read from each EDGAR .txt table (None = all). Matches what the
+# reconstructor actually uses; TAG.doc is long free text and never read here.
+TABLE_COLS = {
+    'pre': ['adsh', 'report', 'line', 'stmt', 'inpth', 'tag', 'plabel', 'negating'],
+    'num': ['adsh', 'tag', 'ddate', 'qtrs', 'uom', 'segments', 'coreg', 'value'],
+    'tag': ['tag', 'version', 'custom', 'abstract', 'datatype', 'iord', 'crdr', 'tlabel'],
+    'sub': None,
+}
+
+# Explicit Arrow types for the CSV reader; any column not listed is a string.
+# Dictionary columns (repeated strings) arrive in pandas as categoricals.
+# ddate/qtrs/report stay strings: they are public period keys / output values.
+_DICT = pa.dictionary(pa.int32(), pa.string())
+TABLE_SCHEMAS = {
+    'pre': {'adsh': _DICT, 'stmt': _DICT, 'tag': _DICT, 'line': pa.int32(), 'inpth': pa.int16()},
+    'num': {'adsh': _DICT, 'tag': _DICT, 'uom': _DICT, 'value': pa.float64()},
+    'tag': {},
+    'sub': {},
+}
+
+# Plain (non-categorical) string columns that are filtered with ==: held as
+# Arrow-backed strings so comparisons run in Arrow's compute kernels. These
+# columns are never null in EDGAR, so values read back are plain str.
+_ARROW_STRING = pd.StringDtype('pyarrow')
+ARROW_STRING_COLS = {
+    'pre': ('report',),
+    'num': ('ddate', 'qtrs'),
+}
+
+# TAG columns copied onto each node as metadata
+TAG_META_FIELDS = ('custom', 'tlabel', 'datatype', 'iord', 'crdr')
+
+# Parquet snapshot layout: per-filing tables are stored clustered by adsh in
+# modest row groups, so a filtered read of one filing touches a few groups
+PARQUET_ADSH_SORTED = ('pre', 'num')
+PARQUET_ROW_GROUP_SIZE = 64_000
+
+# Strings read as missing: Arrow's defaults plus the two extra pandas treats as NA
+_NULL_VALUES = pa_csv.ConvertOptions().null_values + ['<NA>', 'None']
+
+# Process-wide cache of loaded tables shared by all reconstructor instances:
+# {(year, quarter, table_name): (df, adsh_index or None)}, least recently used
+# first. Bounded so a multi-quarter run keeps at most two quarters' tables.
+_TABLE_CACHE_SIZE = 8
+_TABLE_CACHE: 'OrderedDict[Tuple[int, int, str], Tuple[pd.DataFrame, Optional[Dict[str, np.ndarray]]]]' = OrderedDict()
+
+
+def _days_from_civil(year: int, month: int, day: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date (integer-only)"""
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civil_from_days(days: int) -> int:
+    """Inverse of _days_from_civil, returned as a YYYYMMDD integer"""
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + (3 if mp < 10 else -9)
+    year = yoe + era * 400 + (month <= 2)
+    return year * 10000 + month * 100 + day
+
+
+@functools.lru_cache(maxsize=4096)
+def _infer_beginning(ending_ddate: str, qtrs: str, instant_dates: Tuple[str, ...]) -> str:
+    """
+    Infer beginning cash balance date using duration calculation
+    and closest match approach (validated 100% across test companies)
+
+    Args:
+        ending_ddate: Period end date (YYYYMMDD)
+        qtrs: Duration in quarters
+        instant_dates: Sorted instant ddates available in the filing
+
+    Returns:
+        The instant date before ending_ddate closest to the approximate start
+    """
+    # Calculate approximate beginning date: 30.5 days per month
+    # (validated to be accurate enough). The half day of an odd quarter
+    # count rounds back to the previous calendar date, i.e. subtract
+    # ceil(qtrs * 91.5) whole days - done in integer day numbers
+    end_days = _days_from_civil(int(ending_ddate[:4]), int(ending_ddate[4:6]), int(ending_ddate[6:8]))
+    approx_int = _civil_from_days(end_days - (int(qtrs) * 183 + 1) // 2)
+
+    # Find closest actual instant date before ending date (dates are sorted)
+    past_dates = instant_dates[:bisect_left(instant_dates, ending_ddate)]
+    if not past_dates:
+        return ending_ddate  # Fallback (shouldn't happen in practice)
+
+    # Find closest match to approximation (argmin keeps the first on ties)
+    past_ints = np.array([int(d) for d in past_dates], dtype=np.int64)
+    return past_dates[int(np.argmin(np.abs(past_ints - approx_int)))]
+
+
+def _intern_strings(values: list) -> list:
+    """
+    sys.intern each str in a list (anything else, e.g. NaN, passes through)
+
+    Tags and period strings repeat across nodes, lookup keys and values
+    dicts; interned, they are stored once and dict probes on them usually
+    succeed on the identity check before comparing characters.
+    """
+    return [sys.intern(v) if type(v) is str else v for v in values]
+
+
+# date(1970, 1, 1).toordinal(): shifts _days_from_civil to proleptic ordinals
+_EPOCH_ORDINAL = 719163
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+@functools.lru_cache(maxsize=4096)
+def _ddate_ordinal(ddate: str) -> Optional[int]:
+    """
+    Day ordinal (date.toordinal()) of a YYYYMMDD date string, or None if it
+    does not parse
+
+    Canonical 8-digit ddates are decoded with integer arithmetic; anything
+    else goes through strptime so odd inputs parse (or fail) exactly as
+    before.
+    """
+    if type(ddate) is str and len(ddate) == 8 and ddate.isascii() and ddate.isdigit():
+        year, month, day = int(ddate[:4]), int(ddate[4:6]), int(ddate[6:8])
+        if year < 1 or not 1 <= month <= 12:
+            return None
+        leap = month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        if not 1 <= day <= _MONTH_DAYS[month - 1] + leap:
+            return None
+        return _days_from_civil(year, month, day) + _EPOCH_ORDINAL
+    try:
+        return datetime.strptime(ddate, '%Y%m%d').toordinal()
+    except (TypeError, ValueError):
+        return None
 
 
-@dataclass
+# Parent codes returned by _parent_map (non-negative values are row indices)
+PARENT_NONE = -1          # The statement's own root row
+PARENT_VIRTUAL_ROOT = -2  # Attached to the virtual {stmt}_ROOT node
+PARENT_ORPHAN = -3        # No parent at level - 1 (dropped, with a warning)
+
+
+def _parent_map(levels: List[int]) -> np.ndarray:
+    """
+    Resolve each PRE row's parent from indentation levels alone
+
+    Pure-integer version of the presentation stack walk: stack[k] holds the
+    latest row seen at level k, with stack[:top + 1] live. Entries above a
+    shallower row are not cleared, so a later deeper row can still attach
+    to them. A second level-0 row moves everything under a virtual root and
+    resets the stack to [virtual root, row].
+
+    Args:
+        levels: inpth per row, in presentation order
+
+    Returns:
+        int32 array: parent row index, or PARENT_NONE / PARENT_VIRTUAL_ROOT /
+        PARENT_ORPHAN
+    """
+    n = len(levels)
+    parents = [PARENT_ORPHAN] * n
+    stack = [PARENT_ORPHAN] * ((max(levels) if n else 0) + 2)
+    top = -1
+    root = None  # Row index of the first level-0 row, then PARENT_VIRTUAL_ROOT
+
+    for i, level in enumerate(levels):
+        if level == 0:
+            if root is None:
+                root = i
+                parents[i] = PARENT_NONE
+                stack[0] = i
+                top = 0
+            else:
+                if root != PARENT_VIRTUAL_ROOT:
+                    parents[root] = PARENT_VIRTUAL_ROOT
+                    root = PARENT_VIRTUAL_ROOT
+                parents[i] = PARENT_VIRTUAL_ROOT
+                stack[0] = PARENT_VIRTUAL_ROOT
+                stack[1] = i
+                top = 1
+        elif level - 1 <= top:
+            parents[i] = stack[level - 1]
+            stack[level] = i
+            if level > top:
+                top = level
+
+    return np.array(parents, dtype=np.int32)
+
+
+@dataclass(slots=True)
 class StatementNode:
     """
     Node in financial statement hierarchy
@@ -36,6 +251,9 @@ class StatementNode:
     - Its values from NUM table (multi-period support)
     - Rich metadata from PRE, NUM, and TAG tables
     - References to parent and children
+
+    Slotted: no per-instance __dict__, so large hierarchies stay small and
+    attribute reads in the tree walks are fixed-offset lookups.
     """
     # Core identification
     tag: str                    # XBRL tag name (e.g., 'Assets')
@@ -47,6 +265,7 @@ class StatementNode:
     line: int = None            # Line number in presentation order
     level: int = 0              # Indentation level (inpth)
     negating: bool = False      # If True, subtract from parent
+    is_beginning: bool = False  # plabel mentions 'beginning' (CF beginning balance)
 
     # NUM table fields - Multi-period support
     values: Dict[Tuple[str, str], float] = field(default_factory=dict)  # {(ddate, qtrs): value}
@@ -70,13 +289,103 @@ class StatementNode:
 
     # Calc graph integration (from XBRL calculation linkbase)
     is_sum: bool = False  # True if this tag is a parent in calc graph
-    calc_children: List[Tuple[str, float]] = field(default_factory=list)  # [(child_tag, weight), ...]
+    calc_children: Tuple[Tuple, ...] = ()  # ((child_tag, weight, plabel), ...), shared per calc parent
 
     def __repr__(self):
         value_str = f"${self.value:,.0f}" if self.value else "None"
         return f"{'  ' * self.level}{self.plabel} ({self.tag}): {value_str}"
 
 
+@dataclass(slots=True)
+class HierarchyTable:
+    """
+    Flat (structure-of-arrays) view of a StatementNode hierarchy
+
+    Row i is the i-th node in pre-order (row 0 is the root). Columns are
+    parallel numpy arrays; children are stored CSR-style, so the children of
+    row i are children_indices[children_offsets[i]:children_offsets[i + 1]]
+    in presentation order. Whole-tree passes (rollup sums, counts) become
+    array operations instead of pointer-chasing through node objects.
+    """
+    nodes: List[StatementNode]       # Row -> node (for writing results back)
+    tags: np.ndarray                 # object
+    values: np.ndarray               # float64, NaN where node.value is None
+    has_value: np.ndarray            # bool, node.value is not None
+    levels: np.ndarray               # int16
+    parent_idx: np.ndarray           # intp, -1 for the root
+    sign: np.ndarray                 # float64, -1.0 for negating nodes
+    children_offsets: np.ndarray     # intp, length n + 1
+    children_indices: np.ndarray     # intp, child rows grouped by parent
+
+    @classmethod
+    def from_root(cls, root: StatementNode) -> 'HierarchyTable':
+        """Flatten a hierarchy in pre-order (children in presentation order)"""
+        nodes = []
+        parents = []
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            idx = len(nodes)
+            nodes.append(node)
+            parents.append(parent)
+            stack.extend((child, idx) for child in reversed(node.children))
+
+        n = len(nodes)
+        parent_idx = np.asarray(parents, dtype=np.intp)
+
+        # Pre-order lists children after their parent in child order, so a
+        # stable sort on parent index groups them without reordering
+        child_rows = np.flatnonzero(parent_idx >= 0)
+        children_indices = child_rows[np.argsort(parent_idx[child_rows], kind='stable')]
+        children_offsets = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(parent_idx[child_rows], minlength=n), out=children_offsets[1:])
+
+        return cls(
+            nodes=nodes,
+            tags=np.array([node.tag for node in nodes], dtype=object),
+            values=np.fromiter((np.nan if node.value is None else node.value for node in nodes),
+                               dtype=np.float64, count=n),
+            has_value=np.fromiter((node.value is not None for node in nodes), dtype=bool, count=n),
+            levels=np.fromiter((node.level for node in nodes), dtype=np.int16, count=n),
+            parent_idx=parent_idx,
+            sign=np.fromiter((-1.0 if node.negating else 1.0 for node in nodes),
+                             dtype=np.float64, count=n),
+            children_offsets=children_offsets,
+            children_indices=children_indices
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def children(self, i: int) -> np.ndarray:
+        """Row indices of node i's children, in presentation order"""
+        return self.children_indices[self.children_offsets[i]:self.children_offsets[i + 1]]
+
+    def child_counts(self) -> np.ndarray:
+        """Number of children per row"""
+        return np.diff(self.children_offsets)
+
+    def child_sums(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Sum a per-row array over each row's children (0.0 for leaves)
+
+        One np.add.reduceat over the CSR child list; each segment is added
+        in presentation order.
+        """
+        sums = np.zeros(len(self.nodes), dtype=np.float64)
+        has_children = self.child_counts() > 0
+        if has_children.any():
+            # Empty segments are dropped from the starts: reduceat would
+            # otherwise return the element at the offset instead of 0
+            starts = self.children_offsets[:-1][has_children]
+            sums[has_children] = np.add.reduceat(weights[self.children_indices], starts)
+        return sums
+
+    def value_count(self) -> int:
+        """Number of nodes with a value attached"""
+        return int(self.has_value.sum())
+
+
 class StatementReconstructor:
     """
     Reconstructs financial statements from EDGAR data
@@ -109,16 +418,39 @@ class StatementReconstructor:
         # Database engine (lazy init)
         self._engine = None
 
+        # Most recently loaded filing: (adsh, filing_data). Reconstructing
+        # BS, IS, CF... of one filing back to back loads it once.
+        self._filing_cache: Optional[Tuple[str, Dict]] = None
+
         # Cache for loaded data (avoid reloading large files)
         self._pre_df: Optional[pd.DataFrame] = None
         self._num_df: Optional[pd.DataFrame] = None
         self._tag_df: Optional[pd.DataFrame] = None
         self._sub_df: Optional[pd.DataFrame] = None
 
-    def _log(self, message: str):
-        """Print message only if verbose mode is enabled"""
+        # Row positions per filing for the per-adsh tables {adsh: ndarray}
+        self._pre_index: Optional[Dict[str, np.ndarray]] = None
+        self._num_index: Optional[Dict[str, np.ndarray]] = None
+        self._sub_index: Optional[Dict[str, np.ndarray]] = None
+
+        # Read only each filing's rows from the adsh-sorted Parquet snapshots
+        # instead of loading whole PRE/NUM/SUB (set for spawned batch workers)
+        self._filtered_reads = False
+
+    def _log(self, message: str, *args):
+        """
+        Progress message: printed if verbose mode is enabled, otherwise sent
+        to the module logger at DEBUG. %-style args are only formatted when
+        the message is actually emitted.
+        """
         if self.verbose:
-            print(message)
+            print(message % args if args else message)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(message, *args)
+
+    def _log_enabled(self) -> bool:
+        """True if _log output goes anywhere (guard for costly messages)"""
+        return self.verbose or logger.isEnabledFor(logging.DEBUG)
 
     def _get_engine(self):
         """Get SQLAlchemy engine (lazy initialization)"""
@@ -127,18 +459,221 @@ class StatementReconstructor:
         return self._engine
 
     def _load_table(self, table_name: str) -> pd.DataFrame:
-        """Load EDGAR table with caching"""
+        """Load EDGAR table with caching (shared across instances)"""
         cache_attr = f'_{table_name}_df'
 
         if getattr(self, cache_attr) is None:
-            file_path = self.base_dir / f'{table_name}.txt'
-            self._log(f"Loading {table_name}.txt...")
-            df = pd.read_csv(file_path, sep='\t', dtype=str, low_memory=False)
+            key = (self.year, self.quarter, table_name)
+            if key in _TABLE_CACHE:
+                _TABLE_CACHE.move_to_end(key)
+            else:
+                df = self._read_table(table_name)
+                if table_name == 'pre':
+                    df = self._normalize_pre(df)
+                elif table_name == 'num':
+                    df = self._normalize_num(df)
+                self._log("  Loaded %s rows", f"{len(df):,}")
+
+                # Index PRE/NUM/SUB rows by filing once, so per-filing slices
+                # are a take() instead of a full-table adsh scan
+                index = None
+                if table_name in ('pre', 'num', 'sub'):
+                    index = df.groupby('adsh', observed=True).indices
+
+                _TABLE_CACHE[key] = (df, index)
+                while len(_TABLE_CACHE) > _TABLE_CACHE_SIZE:
+                    _TABLE_CACHE.popitem(last=False)
+
+            df, index = _TABLE_CACHE[key]
             setattr(self, cache_attr, df)
-            self._log(f"  Loaded {len(df):,} rows")
+            if index is not None:
+                setattr(self, f'_{table_name}_index', index)
 
         return getattr(self, cache_attr)
 
+    def _read_table(self, table_name: str) -> pd.DataFrame:
+        """
+        Read EDGAR table, preferring a Parquet snapshot next to the .txt
+
+        The snapshot is written on the first TSV parse and reused while it
+        is at least as new as the .txt and still has the needed columns.
+        """
+        file_path = self.base_dir / f'{table_name}.txt'
+        parquet_path = self._snapshot_path(table_name)
+        usecols = TABLE_COLS.get(table_name)
+
+        if parquet_path is not None:
+            self._log("Loading %s.parquet...", table_name)
+            try:
+                return self._restore_nulls(pd.read_parquet(parquet_path, columns=usecols))
+            except (OSError, ValueError) as e:
+                # Stale schema or unreadable file - fall back to the TSV
+                self._log("  Parquet snapshot unusable (%s), re-parsing %s.txt", e, table_name)
+
+        self._log("Loading %s.txt...", table_name)
+        schema = TABLE_SCHEMAS.get(table_name, {})
+        try:
+            df = self._read_tsv_arrow(file_path, usecols, schema)
+        except pa.ArrowInvalid as e:
+            # Malformed row or unparseable number: the pandas parser is more
+            # forgiving (values are coerced later by the normalize helpers)
+            self._log("  Arrow CSV reader failed (%s), using pandas parser", e)
+            dtypes = {col: str for col in usecols} if usecols else {}
+            dtypes.update({col: 'category' for col, typ in schema.items()
+                           if pa.types.is_dictionary(typ) and col in dtypes})
+            df = pd.read_csv(file_path, sep='\t', usecols=usecols,
+                             dtype=dtypes or str, low_memory=False)
+
+        if table_name in PARQUET_ADSH_SORTED:
+            df = self._sort_by_adsh(df)
+
+        parquet_path = self.base_dir / f'{table_name}.parquet'
+        try:
+            df.to_parquet(parquet_path, compression='zstd', index=False,
+                          row_group_size=PARQUET_ROW_GROUP_SIZE)
+        except (OSError, ValueError) as e:
+            self._log("  Could not write %s: %s", parquet_path.name, e)
+
+        return df
+
+    def _snapshot_path(self, table_name: str) -> Optional[Path]:
+        """Parquet snapshot for a table if present and not older than its .txt"""
+        file_path = self.base_dir / f'{table_name}.txt'
+        parquet_path = self.base_dir / f'{table_name}.parquet'
+        if (parquet_path.exists() and
+                (not file_path.exists() or
+                 parquet_path.stat().st_mtime >= file_path.stat().st_mtime)):
+            return parquet_path
+        return None
+
+    @staticmethod
+    def _restore_nulls(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Parquet nulls come back as None; restore the NaN the TSV parse
+        produces so downstream isna()/output values match
+        """
+        str_cols = df.select_dtypes('object').columns
+        df[str_cols] = df[str_cols].fillna(np.nan)
+        return df
+
+    def _read_filing_rows(self, table_name: str, adsh: str) -> Optional[pd.DataFrame]:
+        """
+        Read one filing's rows from a table's Parquet snapshot
+
+        The filter is pushed down to the row groups, so only the few groups
+        holding this adsh are decoded. Returns None when there is no usable
+        snapshot (caller falls back to the full-table path).
+        """
+        parquet_path = self._snapshot_path(table_name)
+        if parquet_path is None:
+            return None
+
+        try:
+            table = pa_ds.dataset(parquet_path, format='parquet').to_table(
+                columns=TABLE_COLS.get(table_name),
+                filter=pa_ds.field('adsh') == adsh)
+        except (OSError, pa.ArrowInvalid) as e:
+            self._log("  Filtered read of %s failed (%s)", parquet_path.name, e)
+            return None
+
+        return self._restore_nulls(table.to_pandas())
+
+    @staticmethod
+    def _sort_by_adsh(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cluster rows by adsh (lexical order) so Parquet row-group statistics
+        can prune per-filing reads. The sort is stable: rows keep their
+        original order within a filing.
+        """
+        adsh = df['adsh']
+        if isinstance(adsh.dtype, pd.CategoricalDtype):
+            # Rank categories once instead of comparing every row's string
+            categories = adsh.cat.categories.to_numpy()
+            rank = np.empty(len(categories), dtype=np.int64)
+            rank[np.argsort(categories, kind='stable')] = np.arange(len(categories))
+            key = rank[adsh.cat.codes.to_numpy()]
+        else:
+            key = adsh.to_numpy()
+        order = np.argsort(key, kind='stable')
+        return df.take(order).reset_index(drop=True)
+
+    @staticmethod
+    def _read_tsv_arrow(file_path: Path, usecols: Optional[List[str]],
+                        schema: Dict[str, pa.DataType]) -> pd.DataFrame:
+        """
+        Parse an EDGAR tab-separated file with the pyarrow CSV reader
+
+        Every column is typed explicitly (strings unless listed in schema), so
+        nothing is type-inferred; empty/NA fields become NaN as with read_csv.
+        """
+        if usecols is None:
+            with open(file_path, encoding='utf-8') as f:
+                usecols = f.readline().rstrip('\r\n').split('\t')
+
+        column_types = {col: schema.get(col, pa.string()) for col in usecols}
+        table = pa_csv.read_csv(
+            file_path,
+            parse_options=pa_csv.ParseOptions(delimiter='\t'),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                include_columns=usecols,
+                null_values=_NULL_VALUES,
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas()
+
+        # Arrow string nulls come back as None; use NaN like read_csv does
+        str_cols = df.select_dtypes('object').columns
+        df[str_cols] = df[str_cols].fillna(np.nan)
+        return df
+
+    @staticmethod
+    def _arrow_string_columns(df: pd.DataFrame, cols) -> Dict[str, pd.Series]:
+        """Arrow-string versions of the object-dtype columns among cols"""
+        return {col: df[col].astype(_ARROW_STRING) for col in cols
+                if col in df.columns and df[col].dtype == object}
+
+    @staticmethod
+    def _normalize_pre(pre_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert PRE line/inpth to integers, negating to bool and report
+        (when it is a string) to an Arrow string
+
+        One vectorized pass at load time, so build_hierarchy works on
+        native types. Idempotent: if every column is already converted the
+        same frame is returned, otherwise a new one (input is not mutated).
+        """
+        converted = StatementReconstructor._arrow_string_columns(pre_df, ARROW_STRING_COLS['pre'])
+        for col in ('line', 'inpth'):
+            if col in pre_df.columns and not pd.api.types.is_integer_dtype(pre_df[col]):
+                converted[col] = pd.to_numeric(pre_df[col], downcast='integer')
+
+        # PRE table stores negating as '1' (true) or '0' (false), or NaN
+        if 'negating' in pre_df.columns and not pd.api.types.is_bool_dtype(pre_df['negating']):
+            converted['negating'] = pre_df['negating'].fillna('0').astype(str).isin(('1', 'true', 'True'))
+
+        return pre_df.assign(**converted) if converted else pre_df
+
+    @staticmethod
+    def _normalize_num(num_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert NUM value to float64, ddate/qtrs to Arrow strings and flag
+        consolidated rows, once per table
+
+        Adds 'consolidated' (segments and coreg both NaN) so the instant-date
+        scan reads one bool column. Per-filing slices then arrive prepared and
+        attach_values skips these steps. Unparseable values become NaN.
+        Idempotent, input is not mutated.
+        """
+        converted = StatementReconstructor._arrow_string_columns(num_df, ARROW_STRING_COLS['num'])
+        if 'value' in num_df.columns and not pd.api.types.is_numeric_dtype(num_df['value']):
+            converted['value'] = pd.to_numeric(num_df['value'], errors='coerce')
+        if ('consolidated' not in num_df.columns and
+                'segments' in num_df.columns and 'coreg' in num_df.columns):
+            converted['consolidated'] = num_df['segments'].isna() & num_df['coreg'].isna()
+        return num_df.assign(**converted) if converted else num_df
+
     def load_filing_data(self, adsh: str) -> Dict:
         """
         Load PRE, NUM, TAG, SUB data for specific filing
@@ -154,9 +689,19 @@ class StatementReconstructor:
         else:
             return self._load_filing_data_from_files(adsh)
 
+    def _get_filing_data(self, adsh: str) -> Dict:
+        """load_filing_data, reusing the previous result for the same adsh"""
+        cached = self._filing_cache
+        if cached is not None and cached[0] == adsh:
+            return cached[1]
+
+        filing_data = self.load_filing_data(adsh)
+        self._filing_cache = (adsh, filing_data)
+        return filing_data
+
     def _load_filing_data_from_db(self, adsh: str) -> Dict:
         """Load filing data from PostgreSQL database (fast)"""
-        self._log(f"\nLoading filing data for {adsh} from database...")
+        self._log("\nLoading filing data for %s from database...", adsh)
 
         engine = self._get_engine()
 
@@ -170,6 +715,7 @@ class StatementReconstructor:
             engine,
             params={'adsh': adsh, 'year': self.year, 'quarter': self.quarter}
         )
+        filing_pre = self._normalize_pre(filing_pre)
 
         # Query NUM data for this filing
         filing_num = pd.read_sql(
@@ -181,6 +727,7 @@ class StatementReconstructor:
             engine,
             params={'adsh': adsh, 'year': self.year, 'quarter': self.quarter}
         )
+        filing_num = self._normalize_num(filing_num)
 
         # Query TAG data - get all tags used in this filing
         tags_in_filing = set(filing_pre['tag'].tolist()) | set(filing_num['tag'].tolist())
@@ -214,9 +761,10 @@ class StatementReconstructor:
 
         filing_sub = filing_sub_df.iloc[0]
 
-        self._log(f"  PRE rows: {len(filing_pre):,}")
-        self._log(f"  NUM rows: {len(filing_num):,}")
-        self._log(f"  Filing: {filing_sub['name']} {filing_sub['form']} FY{filing_sub['fy']} {filing_sub['fp']}")
+        self._log("  PRE rows: %d", len(filing_pre))
+        self._log("  NUM rows: %d", len(filing_num))
+        self._log("  Filing: %s %s FY%s %s",
+                  filing_sub['name'], filing_sub['form'], filing_sub['fy'], filing_sub['fp'])
 
         return {
             'pre': filing_pre,
@@ -225,29 +773,60 @@ class StatementReconstructor:
             'sub': filing_sub
         }
 
+    def _load_filing_rows_from_parquet(self, adsh: str) -> Optional[Tuple[pd.DataFrame, pd.DataFrame, pd.Series]]:
+        """
+        Read one filing's PRE, NUM and SUB rows via filtered Parquet reads
+
+        Returns:
+            (filing_pre, filing_num, filing_sub), or None if any snapshot is
+            missing or unreadable
+        """
+        frames = [self._read_filing_rows(table_name, adsh) for table_name in ('pre', 'num', 'sub')]
+        if any(df is None for df in frames):
+            return None
+
+        filing_pre, filing_num, filing_sub = frames
+        if filing_sub.empty:
+            raise ValueError(f"Filing {adsh} not found in SUB table")
+
+        return (self._normalize_pre(filing_pre), self._normalize_num(filing_num),
+                filing_sub.iloc[0])
+
     def _load_filing_data_from_files(self, adsh: str) -> Dict:
         """Load filing data from .txt files (original behavior)"""
-        self._log(f"\nLoading filing data for {adsh} from files...")
+        self._log("\nLoading filing data for %s from files...", adsh)
 
-        # Load full tables (cached)
-        pre_df = self._load_table('pre')
-        num_df = self._load_table('num')
         tag_df = self._load_table('tag')
-        sub_df = self._load_table('sub')
 
-        # Filter to this filing
-        filing_pre = pre_df[pre_df['adsh'] == adsh].copy()
-        filing_num = num_df[num_df['adsh'] == adsh].copy()
-        filing_sub = sub_df[sub_df['adsh'] == adsh]
+        if self._filtered_reads:
+            filing_data = self._load_filing_rows_from_parquet(adsh)
+            if filing_data is not None:
+                filing_pre, filing_num, filing_sub = filing_data
+            else:
+                # No snapshots to filter: load whole tables from now on
+                self._filtered_reads = False
 
-        if len(filing_sub) == 0:
-            raise ValueError(f"Filing {adsh} not found in SUB table")
+        if not self._filtered_reads:
+            # Load full tables (cached)
+            pre_df = self._load_table('pre')
+            num_df = self._load_table('num')
+            sub_df = self._load_table('sub')
+
+            # Filter to this filing (take() already returns new frames)
+            no_rows = np.array([], dtype=np.intp)
+            filing_pre = pre_df.take(self._pre_index.get(adsh, no_rows))
+            filing_num = num_df.take(self._num_index.get(adsh, no_rows))
+            sub_rows = self._sub_index.get(adsh, no_rows)
 
-        filing_sub = filing_sub.iloc[0]  # Get as Series
+            if len(sub_rows) == 0:
+                raise ValueError(f"Filing {adsh} not found in SUB table")
 
-        self._log(f"  PRE rows: {len(filing_pre):,}")
-        self._log(f"  NUM rows: {len(filing_num):,}")
-        self._log(f"  Filing: {filing_sub['name']} {filing_sub['form']} FY{filing_sub['fy']} {filing_sub['fp']}")
+            filing_sub = sub_df.iloc[sub_rows[0]]  # Get as Series
+
+        self._log("  PRE rows: %d", len(filing_pre))
+        self._log("  NUM rows: %d", len(filing_num))
+        self._log("  Filing: %s %s FY%s %s",
+                  filing_sub['name'], filing_sub['form'], filing_sub['fy'], filing_sub['fp'])
 
         return {
             'pre': filing_pre,
@@ -278,35 +857,70 @@ class StatementReconstructor:
         Returns:
             Root node of statement hierarchy, or None if no data
         """
-        # Filter to specific statement type
-        stmt_df = pre_df[pre_df['stmt'] == stmt].copy()
+        return self._build_hierarchy(pre_df, stmt)[0]
+
+    def _build_hierarchy(self, pre_df: pd.DataFrame, stmt: str = 'BS',
+                         tag_df: Optional[pd.DataFrame] = None
+                         ) -> Tuple[Optional[StatementNode], Dict[str, List[StatementNode]]]:
+        """
+        build_hierarchy, also returning {tag: [nodes]} for every node in the tree
+
+        The tag index is filled while nodes are attached (orphans are left out),
+        so attach_values can iterate it directly instead of walking the tree.
+        If tag_df is given, TAG metadata (custom, tlabel, datatype, iord,
+        crdr) is set as each node is created; tags missing from TAG keep the
+        defaults.
+        """
+        nodes_by_tag: Dict[str, List[StatementNode]] = {}
+
+        # Filter to specific statement type (boolean indexing already
+        # returns a new frame, and nothing below writes into it)
+        stmt_df = pre_df[pre_df['stmt'] == stmt]
 
         if len(stmt_df) == 0:
-            self._log(f"  Warning: No {stmt} statement found in PRE table")
-            return None
+            self._log("  Warning: No %s statement found in PRE table", stmt)
+            return None, nodes_by_tag
 
         # Many filings have multiple "reports" for one statement
         # (e.g., main statement + parenthetical details)
         # Focus on the largest report (usually the main statement)
         main_report = None
         if 'report' in stmt_df.columns:
-            report_counts = stmt_df.groupby('report').size()
-            main_report = report_counts.idxmax()
-            stmt_df = stmt_df[stmt_df['report'] == main_report].copy()
-            self._log(f"\nBuilding hierarchy for {stmt} statement (report {main_report}, {len(stmt_df)} rows)...")
+            # One hash count (no group sort); ties go to the smallest report
+            # key, which is what groupby(...).size().idxmax() picked
+            report_counts = stmt_df['report'].value_counts(sort=False)
+            main_report = report_counts.index[report_counts.to_numpy() == report_counts.max()].min()
+            stmt_df = stmt_df[stmt_df['report'] == main_report]
+            self._log("\nBuilding hierarchy for %s statement (report %s, %d rows)...",
+                      stmt, main_report, len(stmt_df))
         else:
-            self._log(f"\nBuilding hierarchy for {stmt} statement ({len(stmt_df)} rows)...")
-
-        # Sort by line number to process in presentation order
-        stmt_df = stmt_df.sort_values('line')
-
-        # Convert inpth to int (indentation level)
-        stmt_df['inpth'] = stmt_df['inpth'].astype(int)
-        stmt_df['line'] = stmt_df['line'].astype(int)
-
-        # Handle negating field (may be NaN)
-        # PRE table stores negating as '1' (true) or '0' (false), or NaN
-        stmt_df['negating'] = stmt_df['negating'].fillna('0')
+            self._log("\nBuilding hierarchy for %s statement (%d rows)...", stmt, len(stmt_df))
+
+        # Integer line/inpth and bool negating (no-op if already done at load)
+        stmt_df = self._normalize_pre(stmt_df)
+
+        # Presentation order: a stable permutation by line number, applied to
+        # each column array instead of materializing a sorted frame copy
+        order = np.argsort(stmt_df['line'].to_numpy(), kind='stable')
+
+        # Pull the columns we need out once as plain Python lists
+        # (avoids building a Series per row with iterrows)
+        tags = _intern_strings(stmt_df['tag'].to_numpy()[order].tolist())
+        plabels = stmt_df['plabel'].to_numpy()[order].tolist() if 'plabel' in stmt_df.columns else tags
+        levels = stmt_df['inpth'].to_numpy()[order].tolist()
+        lines = stmt_df['line'].to_numpy()[order].tolist()
+        negatings = stmt_df['negating'].to_numpy()[order].tolist()
+        # Beginning-balance lines (CF): just need the 'beginning' keyword, e.g.
+        # "beginning balances", "beginning of period", "beginning of year"
+        label_col = 'plabel' if 'plabel' in stmt_df.columns else 'tag'
+        beginnings = (stmt_df[label_col].str.lower()
+                      .str.contains('beginning', regex=False, na=False)
+                      .to_numpy()[order].tolist())
+
+        # TAG metadata is static per tag, so it goes in at construction
+        tag_meta = self._build_tag_meta(tag_df, set(tags)) if tag_df is not None else {}
+        no_meta = {}
+        metas = [tag_meta.get(tag, no_meta) for tag in tags]
 
         # Check if this is a flat structure (all items at level 0)
         is_flat = (stmt_df['inpth'] == 0).all()
@@ -322,83 +936,190 @@ class StatementReconstructor:
                 level=-1,
                 line=0
             )
+            nodes_by_tag[root.tag] = [root]
 
-            for _, row in stmt_df.iterrows():
+            for i in range(len(tags)):
                 node = StatementNode(
-                    tag=row['tag'],
-                    plabel=row.get('plabel', row['tag']),
+                    tag=tags[i],
+                    plabel=plabels[i],
                     stmt=stmt,
                     report=main_report,
-                    level=row['inpth'],
-                    line=row['line'],
-                    negating=(row['negating'] == '1'),
-                    parent=root
+                    level=levels[i],
+                    line=lines[i],
+                    negating=negatings[i],
+                    is_beginning=beginnings[i],
+                    parent=root,
+                    **metas[i]
                 )
                 root.children.append(node)
+                nodes_by_tag.setdefault(node.tag, []).append(node)
 
-            return root
+            return root, nodes_by_tag
 
         # Hierarchical structure: Build tree
         self._log("  Detected hierarchical structure")
-        root = None
-        stack = []  # Track current parent at each level
+        parents = _parent_map(levels)
 
-        for _, row in stmt_df.iterrows():
-            node = StatementNode(
-                tag=row['tag'],
-                plabel=row.get('plabel', row['tag']),
+        nodes = [
+            StatementNode(
+                tag=tags[i],
+                plabel=plabels[i],
                 stmt=stmt,
                 report=main_report,
-                level=row['inpth'],
-                line=row['line'],
-                negating=(row['negating'] == '1')
+                level=levels[i],
+                line=lines[i],
+                negating=negatings[i],
+                is_beginning=beginnings[i],
+                **metas[i]
             )
+            for i in range(len(tags))
+        ]
 
-            if node.level == 0:
-                # Root level (e.g., "Total Assets")
+        # Multiple level-0 items: a virtual root holds them
+        root = None
+        if (parents == PARENT_VIRTUAL_ROOT).any():
+            root = StatementNode(
+                tag=f'{stmt}_ROOT',
+                plabel=f'{stmt} Statement',
+                stmt=stmt,
+                report=main_report,
+                level=-1,
+                line=0
+            )
+            nodes_by_tag[root.tag] = [root]
+
+        # Wire children in presentation order
+        for node, p in zip(nodes, parents.tolist()):
+            if p >= 0:
+                parent = nodes[p]
+            elif p == PARENT_VIRTUAL_ROOT:
+                parent = root
+            elif p == PARENT_NONE:
                 if root is None:
                     root = node
-                    stack = [node]
-                else:
-                    # Multiple level-0 items
-                    # Create virtual root to hold them
-                    if root.level != -1:
-                        old_root = root
-                        root = StatementNode(
-                            tag=f'{stmt}_ROOT',
-                            plabel=f'{stmt} Statement',
-                            stmt=stmt,
-                            report=main_report,
-                            level=-1,
-                            line=0
-                        )
-                        root.children.append(old_root)
-                        old_root.parent = root
-
-                    root.children.append(node)
-                    node.parent = root
-                    stack = [root, node]
+                nodes_by_tag.setdefault(node.tag, []).append(node)
+                continue
             else:
-                # Child item - attach to parent
-                parent_level = node.level - 1
+                self._log("  Warning: Orphan node %s at level %s", node.tag, node.level)
+                continue
 
-                if parent_level < len(stack):
-                    parent = stack[parent_level]
-                    parent.children.append(node)
-                    node.parent = parent
+            parent.children.append(node)
+            node.parent = parent
+            nodes_by_tag.setdefault(node.tag, []).append(node)
 
-                    # Update stack for this level
-                    if node.level >= len(stack):
-                        stack.append(node)
-                    else:
-                        stack[node.level] = node
-                else:
-                    self._log(f"  Warning: Orphan node {node.tag} at level {node.level}")
+        return root, nodes_by_tag
+
+    def _index_nodes_by_tag(self, root: StatementNode) -> Dict[str, List[StatementNode]]:
+        """Helper: {tag: [nodes]} for a hierarchy built without the index"""
+        nodes_by_tag: Dict[str, List[StatementNode]] = {}
+        for node in self._get_all_nodes(root):
+            nodes_by_tag.setdefault(node.tag, []).append(node)
+        return nodes_by_tag
+
+    def _build_num_lookup(self, num_df: pd.DataFrame, tags=None) -> Dict[str, Dict[Tuple[str, str], Dict]]:
+        """
+        Index NUM rows by tag, then (ddate, qtrs), keeping the preferred row per key
+
+        Replaces a per-tag scan of num_df with one vectorized pass. The row kept
+        for each key is the one the old filter cascade picked:
+        1. Consolidated (segments=NaN)
+        2. Parent company (coreg=NaN)
+        3. USD
+        Remaining ties keep NUM row order (first row wins).
+
+        Args:
+            num_df: NUM table filtered to specific filing (value already numeric)
+            tags: Optional tags to keep (e.g. the hierarchy's); other NUM rows
+                  are dropped up front so they are never scored or sorted
+
+        Returns:
+            Dict {tag: {(ddate, qtrs): {value, ddate, qtrs, uom, segments, coreg}}}
+            (a node resolves its tag once, then probes only that tag's periods)
+        """
+        if tags is not None and len(num_df) > 0:
+            num_df = num_df[num_df['tag'].isin(list(tags))]
+
+        if len(num_df) == 0:
+            return {}
+
+        # Priority score: segments=NaN outranks coreg=NaN outranks USD
+        score = (4 * num_df['segments'].isna().to_numpy(dtype=np.int8) +
+                 2 * num_df['coreg'].isna().to_numpy(dtype=np.int8) +
+                 (num_df['uom'] == 'USD').to_numpy(dtype=np.int8))
+
+        # Group on integer codes rather than hashing strings: the tag
+        # categorical's codes (factorized if tag is plain str) plus
+        # factorized ddate/qtrs. NaN keys get code -1 and group together.
+        tag_col = num_df['tag']
+        if isinstance(tag_col.dtype, pd.CategoricalDtype):
+            tag_codes = tag_col.cat.codes.to_numpy()
+        else:
+            tag_codes = pd.factorize(tag_col)[0]
+        ddate_codes = pd.factorize(num_df['ddate'])[0]
+        qtrs_codes = pd.factorize(num_df['qtrs'])[0]
+
+        # Sort by key, then best score, then NUM order, so the first row of
+        # each key group is exactly the row the cascade would have returned
+        order = np.lexsort((np.arange(len(num_df)), -score, qtrs_codes, ddate_codes, tag_codes))
+        t, d, q = tag_codes[order], ddate_codes[order], qtrs_codes[order]
+        group_start = np.ones(len(order), dtype=bool)
+        group_start[1:] = (t[1:] != t[:-1]) | (d[1:] != d[:-1]) | (q[1:] != q[:-1])
+        best = num_df.iloc[order[group_start]]
+
+        lookup: Dict[str, Dict[Tuple[str, str], Dict]] = {}
+        for tag, ddate, qtrs, value, uom, segments, coreg in zip(
+                _intern_strings(best['tag'].tolist()), _intern_strings(best['ddate'].tolist()),
+                _intern_strings(best['qtrs'].tolist()), best['value'].tolist(),
+                best['uom'].tolist(), best['segments'].tolist(), best['coreg'].tolist()):
+            lookup.setdefault(tag, {})[(ddate, qtrs)] = {
+                'value': value,
+                'ddate': ddate,
+                'qtrs': qtrs,
+                'uom': uom,
+                'segments': segments,
+                'coreg': coreg
+            }
+        return lookup
 
-        return root
+    def _build_tag_meta(self, tag_df: pd.DataFrame, tags) -> Dict[str, Dict]:
+        """
+        Index TAG metadata for the given tags
+
+        One isin() pass over TAG instead of a full-table scan per node; the
+        first TAG row per tag wins, as with the old per-tag filter.
+
+        Returns:
+            Dict {tag: {custom, tlabel, datatype, iord, crdr}}
+        """
+        if len(tag_df) == 0 or 'tag' not in tag_df.columns:
+            return {}
+
+        rows = tag_df[tag_df['tag'].isin(list(tags))].drop_duplicates('tag', keep='first')
+        columns = [rows[field].tolist() if field in rows.columns else [None] * len(rows)
+                   for field in TAG_META_FIELDS]
+
+        return {
+            tag: dict(zip(TAG_META_FIELDS, values))
+            for tag, *values in zip(rows['tag'].tolist(), *columns)
+        }
+
+    def _instant_dates(self, num_df: pd.DataFrame) -> Tuple[str, ...]:
+        """
+        Sorted distinct ddates of consolidated, parent-company instant facts
+
+        (qtrs == '0', segments NaN, coreg NaN) evaluated as one fused numpy
+        mask; only the matching ddate values are gathered, not whole rows.
+        """
+        if 'consolidated' in num_df.columns:
+            consolidated = num_df['consolidated'].to_numpy()
+        else:
+            consolidated = num_df['segments'].isna().to_numpy() & num_df['coreg'].isna().to_numpy()
+        mask = (num_df['qtrs'] == '0').to_numpy(dtype=bool, na_value=False) & consolidated
+        return tuple(sorted(set(num_df['ddate'].to_numpy()[mask].tolist())))
 
     def attach_values(self, hierarchy: StatementNode, num_df: pd.DataFrame,
-                     tag_df: pd.DataFrame, sub_metadata: pd.Series, stmt_type: str) -> StatementNode:
+                     tag_df: pd.DataFrame, sub_metadata: pd.Series, stmt_type: str,
+                     nodes_by_tag: Optional[Dict[str, List[StatementNode]]] = None) -> StatementNode:
         """
         Attach actual values from NUM table to hierarchy, along with rich metadata
         from NUM and TAG tables.
@@ -413,15 +1134,13 @@ class StatementReconstructor:
             tag_df: Full TAG table for looking up tag metadata
             sub_metadata: Series from SUB table with period, fp, fy, etc.
             stmt_type: Statement type ('BS', 'IS', 'CF', etc.)
+            nodes_by_tag: {tag: [nodes]} from _build_hierarchy (built from the
+                         tree if not given)
 
         Returns:
             Hierarchy with values and metadata attached
         """
-        self._log(f"\nAttaching values from NUM table ({len(num_df):,} rows)...")
-
-        # Convert value to float
-        num_df = num_df.copy()
-        num_df['value'] = pd.to_numeric(num_df['value'], errors='coerce')
+        self._log("\nAttaching values from NUM table (%d rows)...", len(num_df))
 
         # Determine correct ddate and qtrs based on SUB metadata and statement type
         period = sub_metadata['period']  # e.g., '20240630'
@@ -460,189 +1179,20 @@ class StatementReconstructor:
             target_ddate = period
             target_qtrs = '0'
 
-        self._log(f"  Filtering NUM to: ddate={target_ddate}, qtrs={target_qtrs}, segments=NaN, coreg=NaN")
-
-        # Get all available instant dates for beginning cash inference
-        instant_dates_all = num_df[(num_df['qtrs'] == '0') &
-                                   (num_df['segments'].isna()) &
-                                   (num_df['coreg'].isna())]['ddate'].unique()
-        instant_dates_all = sorted(instant_dates_all)
-
-        self._log(f"  Available instant dates: {len(instant_dates_all)} dates")
-
-        def infer_beginning_cash_date(ending_ddate: str, qtrs: str) -> str:
-            """
-            Infer beginning cash balance date using duration calculation
-            and closest match approach (validated 100% across test companies)
-            """
-            from datetime import datetime, timedelta
-
-            # Calculate approximate beginning date
-            end_date = datetime.strptime(ending_ddate, '%Y%m%d')
-            months = int(qtrs) * 3
-            days = months * 30.5  # Approximation (validated to be accurate enough)
-            approx_beginning = end_date - timedelta(days=days)
-            approx_str = approx_beginning.strftime('%Y%m%d')
-
-            # Find closest actual instant date before ending date
-            past_dates = [d for d in instant_dates_all if d < ending_ddate]
-            if not past_dates:
-                return ending_ddate  # Fallback (shouldn't happen in practice)
-
-            # Find closest match to approximation
-            closest = min(past_dates, key=lambda x: abs(int(x) - int(approx_str)))
-            return closest
-
-        def get_num_data_for_tag(tag: str, is_beginning_balance: bool = False) -> Optional[Dict]:
-            """
-            Find the NUM row for this tag in the primary financial statement
-
-            Strategy:
-            1. Filter to exact ddate and qtrs (determined from SUB metadata)
-               SPECIAL: For mixed statements (like CF), check tag's iord field
-                - If tag is Instant (I), use qtrs=0 even if stmt_type is CF
-                - This handles beginning/ending cash balances in CF
-            2. Filter to consolidated (segments=NaN)
-            3. Filter to parent company (coreg=NaN)
-            4. Prefer USD if multiple UOM
-
-            Returns:
-                Dict with value, ddate, qtrs, uom, segments, coreg
-            """
-            matches = num_df[num_df['tag'] == tag].copy()
-
-            if len(matches) == 0:
-                return None
-
-            # Determine correct qtrs and ddate for this specific tag
-            # Check if this tag is instant (balance) vs duration (flow)
-            tag_info = tag_df[tag_df['tag'] == tag]
-            tag_qtrs = target_qtrs
-            tag_ddate = target_ddate
-
-            if len(tag_info) > 0:
-                iord = tag_info.iloc[0].get('iord')
-                # If tag is Instant but we're in a duration statement (CF/IS),
-                # use qtrs=0 for balance items
-                if iord == 'I' and target_qtrs != '0':
-                    tag_qtrs = '0'
-
-                    # Special case: Beginning balance uses INFERRED prior date
-                    if is_beginning_balance:
-                        tag_ddate = infer_beginning_cash_date(target_ddate, target_qtrs)
-
-            # 1. Filter to target date and period
-            matches = matches[(matches['ddate'] == tag_ddate) &
-                            (matches['qtrs'] == tag_qtrs)]
+        self._log("  Filtering NUM to: ddate=%s, qtrs=%s, segments=NaN, coreg=NaN", target_ddate, target_qtrs)
 
-            if len(matches) == 0:
-                return None
-
-            # 2. Filter to consolidated (no segments)
-            if 'segments' in matches.columns:
-                no_segments = matches[matches['segments'].isna()]
-                if len(no_segments) > 0:
-                    matches = no_segments
-
-            # 3. Filter to parent company (no coregistrant)
-            if 'coreg' in matches.columns:
-                no_coreg = matches[matches['coreg'].isna()]
-                if len(no_coreg) > 0:
-                    matches = no_coreg
-
-            # 4. Prefer USD values
-            if 'uom' in matches.columns and len(matches) > 1:
-                usd_matches = matches[matches['uom'] == 'USD']
-                if len(usd_matches) > 0:
-                    matches = usd_matches
-
-            if len(matches) == 0:
-                return None
-
-            # Take first match after filtering
-            row = matches.iloc[0]
-            return {
-                'value': row['value'],
-                'ddate': row['ddate'],
-                'qtrs': row['qtrs'],
-                'uom': row.get('uom'),
-                'segments': row.get('segments'),
-                'coreg': row.get('coreg')
-            }
-
-        def get_tag_metadata(tag: str) -> Dict:
-            """
-            Fetch metadata from TAG table
-
-            Returns:
-                Dict with custom, tlabel, datatype, iord, crdr
-            """
-            tag_row = tag_df[tag_df['tag'] == tag]
-            if len(tag_row) == 0:
-                return {
-                    'custom': None,
-                    'tlabel': None,
-                    'datatype': None,
-                    'iord': None,
-                    'crdr': None
-                }
-
-            row = tag_row.iloc[0]
-            return {
-                'custom': row.get('custom'),
-                'tlabel': row.get('tlabel'),
-                'datatype': row.get('datatype'),
-                'iord': row.get('iord'),
-                'crdr': row.get('crdr')
-            }
-
-        def attach_recursive(node: StatementNode):
-            """Recursively attach values and metadata to tree"""
-            # Check if this is a beginning balance (for CF statements)
-            is_beginning = False
-            if node.plabel:
-                plabel_lower = node.plabel.lower()
-                # More flexible detection: just need 'beginning' keyword
-                # Examples: "beginning balances", "beginning of period", "beginning of year"
-                is_beginning = 'beginning' in plabel_lower
-
-            # Get NUM data (value, ddate, qtrs, uom, segments, coreg)
-            num_data = get_num_data_for_tag(node.tag, is_beginning_balance=is_beginning)
-            if num_data:
-                node.value = num_data['value']
-                node.ddate = num_data['ddate']
-                node.qtrs = num_data['qtrs']
-                node.uom = num_data['uom']
-                node.segments = num_data['segments']
-                node.coreg = num_data['coreg']
-
-            # Get TAG metadata (custom, tlabel, datatype, iord, crdr)
-            tag_meta = get_tag_metadata(node.tag)
-            node.custom = tag_meta['custom']
-            node.tlabel = tag_meta['tlabel']
-            node.datatype = tag_meta['datatype']
-            node.iord = tag_meta['iord']
-            node.crdr = tag_meta['crdr']
-
-            for child in node.children:
-                attach_recursive(child)
-
-        attach_recursive(hierarchy)
+        self._attach_values_impl(hierarchy, num_df, tag_df, [(target_ddate, target_qtrs)],
+                                 nodes_by_tag=nodes_by_tag, store_in='value')
 
         # Count how many values we found
-        def count_values(node: StatementNode) -> int:
-            count = 1 if node.value is not None else 0
-            for child in node.children:
-                count += count_values(child)
-            return count
-
-        value_count = count_values(hierarchy)
-        self._log(f"  Attached {value_count} values")
+        value_count = sum(1 for node in self._iter_nodes(hierarchy) if node.value is not None)
+        self._log("  Attached %d values", value_count)
 
         return hierarchy
 
     def attach_values_for_period(self, hierarchy: StatementNode, num_df: pd.DataFrame,
-                                 tag_df: pd.DataFrame, period: Dict, stmt_type: str) -> StatementNode:
+                                 tag_df: pd.DataFrame, period: Dict, stmt_type: str,
+                                 nodes_by_tag: Optional[Dict[str, List[StatementNode]]] = None) -> StatementNode:
         """
         Attach values for a SPECIFIC period to the hierarchy
 
@@ -661,6 +1211,8 @@ class StatementReconstructor:
                     'type': 'duration' or 'instant'
                 }
             stmt_type: Statement type ('BS', 'IS', 'CF', etc.)
+            nodes_by_tag: {tag: [nodes]} from _build_hierarchy (built from the
+                         tree if not given)
 
         Returns:
             Hierarchy with values attached for this period (stored in values dict)
@@ -668,151 +1220,170 @@ class StatementReconstructor:
         target_ddate = period['ddate']
         target_qtrs = period['qtrs']
 
-        self._log(f"  Attaching values for period: {period['label']}")
-        self._log(f"    ddate={target_ddate}, qtrs={target_qtrs}")
-
-        # Convert value to float
-        num_df = num_df.copy()
-        num_df['value'] = pd.to_numeric(num_df['value'], errors='coerce')
-
-        # Get all available instant dates for beginning cash inference
-        instant_dates_all = num_df[(num_df['qtrs'] == '0') &
-                                   (num_df['segments'].isna()) &
-                                   (num_df['coreg'].isna())]['ddate'].unique()
-        instant_dates_all = sorted(instant_dates_all)
-
-        def infer_beginning_cash_date(ending_ddate: str, qtrs: str) -> str:
-            """Infer beginning cash balance date"""
-            from datetime import datetime, timedelta
-
-            end_date = datetime.strptime(ending_ddate, '%Y%m%d')
-            months = int(qtrs) * 3
-            days = months * 30.5
-            approx_beginning = end_date - timedelta(days=days)
-            approx_str = approx_beginning.strftime('%Y%m%d')
-
-            past_dates = [d for d in instant_dates_all if d < ending_ddate]
-            if not past_dates:
-                return ending_ddate
+        self._log("  Attaching values for period: %s", period['label'])
+        self._log("    ddate=%s, qtrs=%s", target_ddate, target_qtrs)
 
-            closest = min(past_dates, key=lambda x: abs(int(x) - int(approx_str)))
-            return closest
+        self._attach_values_impl(hierarchy, num_df, tag_df, [(target_ddate, target_qtrs)],
+                                 nodes_by_tag=nodes_by_tag, store_in='values')
 
-        def get_num_data_for_tag(tag: str, is_beginning_balance: bool = False) -> Optional[Dict]:
-            """Find NUM row for this tag in this specific period"""
-            matches = num_df[num_df['tag'] == tag].copy()
+        # Count values found for this period
+        # Note: period_key might be different from target if it's a beginning balance
+        # So we count all new values in the values dict
+        value_count = sum(1 for node in self._iter_nodes(hierarchy) if node.values)
 
-            if len(matches) == 0:
-                return None
+        self._log("    Attached values for %d line items", value_count)
 
-            # Determine correct qtrs and ddate for this specific tag
-            tag_info = tag_df[tag_df['tag'] == tag]
-            tag_qtrs = target_qtrs
-            tag_ddate = target_ddate
+        return hierarchy
 
-            if len(tag_info) > 0:
-                iord = tag_info.iloc[0].get('iord')
-                # If tag is Instant but period is duration, use qtrs=0
-                if iord == 'I' and target_qtrs != '0':
-                    tag_qtrs = '0'
+    def attach_values_for_periods(self, hierarchy: StatementNode, num_df: pd.DataFrame,
+                                  tag_df: pd.DataFrame, periods: List[Dict], stmt_type: str,
+                                  nodes_by_tag: Optional[Dict[str, List[StatementNode]]] = None,
+                                  instant_dates: Optional[Tuple[str, ...]] = None) -> StatementNode:
+        """
+        Attach values for several periods in one pass
 
-                    # Beginning balance uses inferred prior date
-                    if is_beginning_balance:
-                        tag_ddate = infer_beginning_cash_date(target_ddate, target_qtrs)
+        Same result as calling attach_values_for_period for each period in
+        order, but the NUM lookup and TAG metadata are built once and each
+        node is visited once for all periods.
 
-            # Filter to target date and period
-            matches = matches[(matches['ddate'] == tag_ddate) &
-                            (matches['qtrs'] == tag_qtrs)]
+        Args:
+            hierarchy: Root node of statement tree
+            num_df: NUM table filtered to specific filing
+            tag_df: Full TAG table for looking up tag metadata
+            periods: Period dicts from PeriodDiscovery (see attach_values_for_period)
+            stmt_type: Statement type ('BS', 'IS', 'CF', etc.)
+            nodes_by_tag: {tag: [nodes]} from _build_hierarchy (built from the
+                         tree if not given)
+            instant_dates: _instant_dates(num_df), if the caller already has it
 
-            if len(matches) == 0:
-                return None
+        Returns:
+            Hierarchy with values attached for every period (stored in values dict)
+        """
+        for period in periods:
+            self._log("  Attaching values for period: %s", period['label'])
+            self._log("    ddate=%s, qtrs=%s", period['ddate'], period['qtrs'])
 
-            # Filter to consolidated (no segments)
-            if 'segments' in matches.columns:
-                no_segments = matches[matches['segments'].isna()]
-                if len(no_segments) > 0:
-                    matches = no_segments
-
-            # Filter to parent company (no coregistrant)
-            if 'coreg' in matches.columns:
-                no_coreg = matches[matches['coreg'].isna()]
-                if len(no_coreg) > 0:
-                    matches = no_coreg
-
-            # Prefer USD values
-            if 'uom' in matches.columns and len(matches) > 1:
-                usd_matches = matches[matches['uom'] == 'USD']
-                if len(usd_matches) > 0:
-                    matches = usd_matches
-
-            if len(matches) == 0:
-                return None
+        self._attach_values_impl(hierarchy, num_df, tag_df,
+                                 [(period['ddate'], period['qtrs']) for period in periods],
+                                 nodes_by_tag=nodes_by_tag, store_in='values',
+                                 instant_dates=instant_dates)
 
-            row = matches.iloc[0]
-            return {
-                'value': row['value'],
-                'ddate': row['ddate'],
-                'qtrs': row['qtrs'],
-                'uom': row.get('uom')
-            }
+        value_count = sum(1 for node in self._iter_nodes(hierarchy) if node.values)
+        self._log("    Attached values for %d line items", value_count)
 
-        def attach_recursive(node: StatementNode):
-            """Recursively attach values for this period"""
-            # Check if this is a beginning balance
-            is_beginning = False
-            if node.plabel:
-                plabel_lower = node.plabel.lower()
-                # More flexible detection: just need 'beginning' keyword
-                # Examples: "beginning balances", "beginning of period", "beginning of year"
-                is_beginning = 'beginning' in plabel_lower
-
-            # Get NUM data for this period
-            num_data = get_num_data_for_tag(node.tag, is_beginning_balance=is_beginning)
-            if num_data:
-                # Store in multi-period values dict
-                period_key = (num_data['ddate'], num_data['qtrs'])
-                node.values[period_key] = num_data['value']
-
-                # Also update single-value fields for backward compatibility
-                # (last period processed will win)
-                node.value = num_data['value']
-                node.ddate = num_data['ddate']
-                node.qtrs = num_data['qtrs']
-                node.uom = num_data.get('uom')
-
-            # Recursively process children
-            for child in node.children:
-                attach_recursive(child)
-
-        attach_recursive(hierarchy)
+        return hierarchy
 
-        # Count values found for this period
-        def count_period_values(node: StatementNode, period_key: Tuple[str, str]) -> int:
-            count = 1 if period_key in node.values else 0
-            for child in node.children:
-                count += count_period_values(child, period_key)
-            return count
+    @staticmethod
+    def _iter_nodes(root: StatementNode) -> Iterator[StatementNode]:
+        """Helper: Yield all nodes in hierarchy, pre-order, without recursion"""
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
 
-        # Note: period_key might be different from target if it's a beginning balance
-        # So we count all new values in the values dict
-        value_count = len([1 for node in self._get_all_nodes(hierarchy)
-                          if len(node.values) > 0])
+    def _get_all_nodes(self, root: StatementNode) -> List[StatementNode]:
+        """Helper: Get all nodes in hierarchy as flat list"""
+        return list(self._iter_nodes(root))
 
-        self._log(f"    Attached values for {value_count} line items")
+    def _attach_values_impl(self, hierarchy: StatementNode, num_df: pd.DataFrame,
+                            tag_df: pd.DataFrame, targets: List[Tuple[str, str]],
+                            nodes_by_tag: Optional[Dict[str, List[StatementNode]]] = None,
+                            store_in: str = 'value',
+                            instant_dates: Optional[Tuple[str, ...]] = None) -> None:
+        """
+        Shared core of attach_values and attach_values_for_period(s)
 
-        return hierarchy
+        Finds each node's NUM row for each target period:
+        1. Exact ddate and qtrs. SPECIAL: an Instant tag (TAG iord='I') in a
+           duration period uses qtrs=0 - beginning/ending cash balances in CF.
+           A beginning balance line uses the inferred prior instant date.
+        2-4. Consolidated, parent company, USD: pre-resolved in the NUM lookup
 
-    def _get_all_nodes(self, root: StatementNode) -> List[StatementNode]:
-        """Helper: Get all nodes in hierarchy as flat list"""
-        nodes = []
+        Args:
+            hierarchy: Root node of statement tree
+            num_df: NUM table filtered to specific filing
+            tag_df: Full TAG table for looking up tag metadata
+            targets: [(ddate, qtrs), ...] periods to attach, in order. The
+                     lookup and metadata are built once for all of them and
+                     nodes are visited once, trying each period in turn, so
+                     per-node writes happen in the same order as one call
+                     per period would make them.
+            nodes_by_tag: {tag: [nodes]} from _build_hierarchy (built from the
+                         tree if not given)
+            store_in: 'value' - single period: set value, ddate, qtrs, uom,
+                      segments, coreg and the TAG metadata fields.
+                      'values' - multi-period: add to node.values under
+                      (ddate, qtrs) and update value/ddate/qtrs/uom (last
+                      period processed wins).
+            instant_dates: _instant_dates(num_df), if the caller already has it
+        """
+        if store_in not in ('value', 'values'):
+            raise ValueError(f"store_in must be 'value' or 'values', got {store_in!r}")
+        single_period = store_in == 'value'
 
-        def collect(node):
-            nodes.append(node)
-            for child in node.children:
-                collect(child)
+        # Value is already float when NUM came through load_filing_data;
+        # this only converts frames passed in by other callers
+        num_df = self._normalize_num(num_df)
 
-        collect(root)
-        return nodes
+        # Get all available instant dates for beginning cash inference
+        instant_dates_all = instant_dates if instant_dates is not None else self._instant_dates(num_df)
+        self._log("  Available instant dates: %d dates", len(instant_dates_all))
+
+        if nodes_by_tag is None:
+            nodes_by_tag = self._index_nodes_by_tag(hierarchy)
+
+        # TAG metadata for this hierarchy's tags, resolved in one vectorized pass
+        tag_meta_by_tag = self._build_tag_meta(tag_df, nodes_by_tag.keys())
+
+        # One pass over NUM (this hierarchy's tags only): best row per (tag, ddate, qtrs)
+        num_lookup = self._build_num_lookup(num_df, tags=nodes_by_tag.keys())
+
+        no_meta = dict.fromkeys(TAG_META_FIELDS)
+
+        # Flat pass over the tag index: metadata and period choice once per tag
+        for tag, nodes in nodes_by_tag.items():
+            meta = tag_meta_by_tag.get(tag)
+
+            if single_period:
+                tag_meta = meta if meta is not None else no_meta
+                for node in nodes:
+                    node.custom = tag_meta['custom']
+                    node.tlabel = tag_meta['tlabel']
+                    node.datatype = tag_meta['datatype']
+                    node.iord = tag_meta['iord']
+                    node.crdr = tag_meta['crdr']
+
+            # Presentation-only tag: no NUM rows in this filing, nothing to attach
+            tag_rows = num_lookup.get(tag)
+            if tag_rows is None:
+                continue
+
+            # Instant tag in a duration period: balance items use qtrs=0
+            is_instant = meta is not None and meta['iord'] == 'I'
+            tag_targets = [(target_ddate, target_qtrs, is_instant and target_qtrs != '0')
+                           for target_ddate, target_qtrs in targets]
+
+            for node in nodes:
+                for target_ddate, target_qtrs, instant_in_duration in tag_targets:
+                    tag_qtrs = '0' if instant_in_duration else target_qtrs
+                    tag_ddate = target_ddate
+                    if instant_in_duration and node.is_beginning:
+                        tag_ddate = _infer_beginning(target_ddate, target_qtrs, instant_dates_all)
+
+                    num_data = tag_rows.get((tag_ddate, tag_qtrs))
+                    if not num_data:
+                        continue
+
+                    node.value = num_data['value']
+                    node.ddate = num_data['ddate']
+                    node.qtrs = num_data['qtrs']
+                    node.uom = num_data['uom']
+                    if single_period:
+                        node.segments = num_data['segments']
+                        node.coreg = num_data['coreg']
+                    else:
+                        node.values[(num_data['ddate'], num_data['qtrs'])] = num_data['value']
 
     def validate_rollups(self, hierarchy: StatementNode, tolerance: float = 0.01) -> Dict:
         """
@@ -831,70 +1402,62 @@ class StatementReconstructor:
                 - 'errors': List of validation errors
                 - 'warnings': List of warnings
         """
-        self._log(f"\nValidating hierarchy rollups (tolerance: {tolerance}%)...")
+        self._log("\nValidating hierarchy rollups (tolerance: %s%%)...", tolerance)
 
         errors = []
         warnings = []
 
-        def validate_node(node: StatementNode):
-            """Validate this node and recurse"""
-            if not node.children or node.value is None:
-                # Leaf node or missing value - skip
-                for child in node.children:
-                    validate_node(child)
-                return
-
-            # Calculate sum of children
-            child_sum = 0
-            missing_values = []
-
-            for child in node.children:
-                if child.value is not None:
-                    # Handle negating items (subtract instead of add)
-                    if child.negating:
-                        child_sum -= child.value
-                    else:
-                        child_sum += child.value
-                else:
-                    missing_values.append(child.tag)
-
-            # Compare parent to child sum
-            if child_sum != 0:  # Avoid division by zero
-                diff = abs(node.value - child_sum)
-                diff_pct = (diff / abs(child_sum)) * 100
-
-                if diff_pct > tolerance:
-                    errors.append({
-                        'node': node.tag,
-                        'label': node.plabel,
-                        'parent_value': node.value,
-                        'child_sum': child_sum,
-                        'diff': diff,
-                        'diff_pct': diff_pct
-                    })
-
-            if missing_values:
-                warnings.append({
-                    'node': node.tag,
-                    'missing_children': missing_values
-                })
-
-            # Recurse to children
-            for child in node.children:
-                validate_node(child)
-
-        validate_node(hierarchy)
+        table = HierarchyTable.from_root(hierarchy)
+        nodes, values, has_value = table.nodes, table.values, table.has_value
+        parent_idx, sign = table.parent_idx, table.sign
+
+        # Child sums for every parent in one pass: negating children
+        # contribute -1 * value, children without a value contribute 0
+        child_sum = table.child_sums(np.where(has_value, sign * values, 0.0))
+
+        # Only parents with a value are checked (leaf / missing value - skip)
+        checked = (table.child_counts() > 0) & has_value
+
+        # Compare parent to child sum (child_sum == 0 skipped: division by zero)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff_pct = np.abs(values - child_sum) / np.abs(child_sum) * 100
+        flagged = checked & (child_sum != 0) & (diff_pct > tolerance)
+
+        for i in np.flatnonzero(flagged):
+            node = nodes[i]
+            node_sum = float(child_sum[i])
+            diff = abs(node.value - node_sum)
+            errors.append({
+                'node': node.tag,
+                'label': node.plabel,
+                'parent_value': node.value,
+                'child_sum': node_sum,
+                'diff': diff,
+                'diff_pct': (diff / abs(node_sum)) * 100
+            })
+
+        # Children without values, per checked parent in tree order. The CSR
+        # child list is grouped by parent in row order, so masking it keeps
+        # both orders and one split yields every parent's missing tags
+        kids = table.children_indices
+        missing = kids[~has_value[kids] & checked[parent_idx[kids]]]
+        if len(missing):
+            warn_rows, starts = np.unique(parent_idx[missing], return_index=True)
+            missing_tags = np.split(table.tags[missing], starts[1:])
+            warnings = [{'node': nodes[p].tag, 'missing_children': tags.tolist()}
+                        for p, tags in zip(warn_rows.tolist(), missing_tags)]
 
         is_valid = len(errors) == 0
 
-        self._log(f"  Validation: {'PASS' if is_valid else 'FAIL'}")
-        self._log(f"  Errors: {len(errors)}")
-        self._log(f"  Warnings: {len(warnings)}")
+        self._log("  Validation: %s", 'PASS' if is_valid else 'FAIL')
+        self._log("  Errors: %d", len(errors))
+        self._log("  Warnings: %d", len(warnings))
 
-        if errors:
+        if errors and self._log_enabled():
             self._log("\n  Top errors:")
             for err in errors[:5]:
-                self._log(f"    {err['label']}: ${err['parent_value']:,.0f} != ${err['child_sum']:,.0f} ({err['diff_pct']:.2f}% diff)")
+                self._log("    %s: $%s != $%s (%.2f%% diff)", err['label'], f"{err['parent_value']:,.0f}",
+                          f"{err['child_sum']:,.0f}", err['diff_pct'])
 
         return {
             'valid': is_valid,
@@ -902,7 +1465,8 @@ class StatementReconstructor:
             'warnings': warnings
         }
 
-    def _mark_sum_items(self, hierarchy: StatementNode, calc_graph: Dict) -> int:
+    def _mark_sum_items(self, hierarchy: StatementNode, calc_graph: Dict,
+                        calc_parent_lookup: Optional[Dict[str, int]] = None) -> int:
         """
         Mark nodes that appear as parents in the calc graph as sum items.
 
@@ -913,87 +1477,162 @@ class StatementReconstructor:
             hierarchy: Root node of statement tree
             calc_graph: Dict {parent_tag: [(child_tag, weight), ...], ...}
                        Tags may be prefixed (e.g., 'us-gaap_Assets') or not ('Assets')
+            calc_parent_lookup: If given, filled while marking with
+                       {child_tag (unprefixed, lowercase): line of its calc parent}
+                       for every marked node's calc children
 
         Returns:
             int: Number of nodes marked as sum items
 
         Note:
-            calc_children format is enriched to: [(child_tag, weight, plabel_or_None), ...]
-            where plabel is looked up from the statement's line items.
+            calc_children format is enriched to: ((child_tag, weight, plabel_or_None), ...)
+            where plabel is looked up from the statement's line items. Nodes
+            matching the same calc parent share one tuple.
         """
         # Build tag-to-plabel mapping from all nodes in hierarchy
         # This allows us to enrich calc_children with plabel info
         tag_to_plabel = {}
 
-        def build_tag_mapping(node: StatementNode):
+        for node in self._iter_nodes(hierarchy):
             if node.tag:
                 # Store both with and without prefix
                 tag_to_plabel[node.tag] = node.plabel
                 if '_' in node.tag:
                     tag_to_plabel[node.tag.split('_', 1)[1]] = node.plabel
-            for child in node.children:
-                build_tag_mapping(child)
-
-        build_tag_mapping(hierarchy)
 
-        # Build set of sum tags (both with and without prefix for flexible matching)
-        sum_tags = set(calc_graph.keys())
-
-        # Also add versions without prefix for matching
-        sum_tags_no_prefix = set()
-        for tag in calc_graph.keys():
-            if '_' in tag:
-                # us-gaap_Assets -> Assets
-                sum_tags_no_prefix.add(tag.split('_', 1)[1])
-            else:
-                sum_tags_no_prefix.add(tag)
+        # Every '_'-suffix of each calc parent (and the tag itself) -> the
+        # first calc parent that has it, i.e. the first full_tag with
+        # full_tag.endswith('_' + tag) or full_tag == tag
+        suffix_to_full = {}
+        for full_tag in calc_graph.keys():
+            suffix_to_full.setdefault(full_tag, full_tag)
+            start = full_tag.find('_')
+            while start != -1:
+                suffix_to_full.setdefault(full_tag[start + 1:], full_tag)
+                start = full_tag.find('_', start + 1)
+
+        # One dict for matching node tags to calc parents:
+        # - unprefixed form of each calc parent (us-gaap_Assets -> Assets)
+        #   -> the first calc parent ending in it
+        # - each calc parent itself -> itself (exact match wins)
+        sum_tag_lookup = {}
+        for full_tag in calc_graph.keys():
+            short_tag = full_tag.split('_', 1)[1] if '_' in full_tag else full_tag
+            sum_tag_lookup[short_tag] = suffix_to_full[short_tag]
+        sum_tag_lookup.update((full_tag, full_tag) for full_tag in calc_graph.keys())
 
         marked_count = 0
 
+        # plabel per calc child tag (exact match, else unprefixed), resolved
+        # once per distinct tag rather than once per (parent, child) pair
+        child_plabels = {}
+
         def get_plabel_for_tag(child_tag: str) -> str:
             """Look up plabel for a child tag, trying various forms."""
-            # Try exact match
+            if child_tag in child_plabels:
+                return child_plabels[child_tag]
             if child_tag in tag_to_plabel:
-                return tag_to_plabel[child_tag]
-            # Try without prefix
-            if '_' in child_tag:
-                unprefixed = child_tag.split('_', 1)[1]
-                if unprefixed in tag_to_plabel:
-                    return tag_to_plabel[unprefixed]
-            return None
-
-        def mark_recursive(node: StatementNode):
-            nonlocal marked_count
+                plabel = tag_to_plabel[child_tag]
+            elif '_' in child_tag:
+                plabel = tag_to_plabel.get(child_tag.split('_', 1)[1])
+            else:
+                plabel = None
+            child_plabels[child_tag] = plabel
+            return plabel
 
-            # Try exact match first
-            tag = node.tag
-            matched_tag = None
+        # Enriched children per calc parent, built once and shared (read-only)
+        # by every node matching that parent
+        enriched_by_tag = {}
 
-            if tag in sum_tags:
-                matched_tag = tag
-            elif tag in sum_tags_no_prefix:
-                # Find the full prefixed tag
-                for full_tag in calc_graph.keys():
-                    if full_tag.endswith('_' + tag) or full_tag == tag:
-                        matched_tag = full_tag
-                        break
+        for node in self._iter_nodes(hierarchy):
+            # Exact match first, else the full prefixed tag for an unprefixed one
+            matched_tag = sum_tag_lookup.get(node.tag)
 
             if matched_tag:
                 node.is_sum = True
                 # Enrich calc_children with plabel: (child_tag, weight, plabel)
-                enriched_children = []
-                for child_tag, weight in calc_graph[matched_tag]:
-                    plabel = get_plabel_for_tag(child_tag)
-                    enriched_children.append((child_tag, weight, plabel))
+                enriched_children = enriched_by_tag.get(matched_tag)
+                if enriched_children is None:
+                    enriched_children = tuple(
+                        (child_tag, weight, get_plabel_for_tag(child_tag))
+                        for child_tag, weight in calc_graph[matched_tag]
+                    )
+                    enriched_by_tag[matched_tag] = enriched_children
                 node.calc_children = enriched_children
                 marked_count += 1
 
-            for child in node.children:
-                mark_recursive(child)
+                if calc_parent_lookup is not None:
+                    parent_line = node.line
+                    for child_tag, _, _ in node.calc_children:
+                        # Normalize tag: remove prefix like 'us-gaap_'
+                        if '_' in child_tag:
+                            child_tag = child_tag.split('_', 1)[1]
+                        child_tag_lower = child_tag.lower()
+                        # If this child already has a parent assigned, prefer the one with greater line number
+                        # Greater line numbers are typically higher-level control items (e.g., Total Assets)
+                        # This handles cases where an item appears under multiple parents in calc graph
+                        existing_parent_line = calc_parent_lookup.get(child_tag_lower)
+                        if existing_parent_line is None or parent_line > existing_parent_line:
+                            calc_parent_lookup[child_tag_lower] = parent_line
 
-        mark_recursive(hierarchy)
         return marked_count
 
+    @staticmethod
+    def _line_item(node: StatementNode, parent_line: Optional[int],
+                   period_values: Optional[Dict[str, float]] = None) -> Dict:
+        """
+        Flat line item dict for a node, shared by both reconstruct paths
+
+        Args:
+            node: Node with values attached
+            parent_line: Line of the parent used for skip logic (presentation
+                         parent for single-period, calc graph parent for
+                         multi-period)
+            period_values: {period_label: value}; adds the 'values' key
+                           (multi-period output)
+        """
+        item = {
+            # Core identification
+            'tag': node.tag,
+            'plabel': node.plabel,
+
+            # PRE table fields
+            'stmt': node.stmt,
+            'report': node.report,
+            'line': node.line or 0,
+            'stmt_order': node.line,  # For section classification
+            'inpth': node.level,
+            'negating': node.negating,
+        }
+
+        if period_values is not None:
+            # Multi-period values: {period_label: value}
+            item['values'] = period_values
+
+        item.update({
+            # NUM table fields (multi-period: last period, for backward compatibility)
+            'value': node.value,
+            'ddate': node.ddate,
+            'qtrs': node.qtrs,
+            'uom': node.uom,
+            'segments': node.segments,
+            'coreg': node.coreg,
+
+            # TAG table fields
+            'custom': node.custom,
+            'tlabel': node.tlabel,
+            'datatype': node.datatype,
+            'iord': node.iord,
+            'crdr': node.crdr,
+
+            # Calc graph fields (from XBRL calculation linkbase)
+            'is_sum': node.is_sum,
+            'calc_children': node.calc_children if node.is_sum else [],
+
+            'parent_line': parent_line,
+        })
+        return item
+
     def reconstruct_statement(self, cik: int, adsh: str, stmt_type: str = 'BS') -> Dict:
         """
         Main entry point: Reconstruct a financial statement
@@ -1016,16 +1655,14 @@ class StatementReconstructor:
                 - 'metadata': Filing metadata
                 - 'flat_data': Flattened tag->value dict
         """
-        self._log(f"\n{'='*60}")
-        self._log(f"Reconstructing {stmt_type} statement")
-        self._log(f"CIK: {cik}, ADSH: {adsh}")
-        self._log(f"{'='*60}")
+        self._log("\n%s\nReconstructing %s statement\nCIK: %s, ADSH: %s\n%s",
+                  _RULE, stmt_type, cik, adsh, _RULE)
 
-        # Step 1: Load filing data
-        filing_data = self.load_filing_data(adsh)
+        # Step 1: Load filing data (reused if the last call was for this filing)
+        filing_data = self._get_filing_data(adsh)
 
-        # Step 2: Build hierarchy
-        hierarchy = self.build_hierarchy(filing_data['pre'], stmt_type)
+        # Step 2: Build hierarchy (plus {tag: [nodes]} for value attachment)
+        hierarchy, nodes_by_tag = self._build_hierarchy(filing_data['pre'], stmt_type)
 
         if hierarchy is None:
             return {
@@ -1037,7 +1674,8 @@ class StatementReconstructor:
 
         # Step 3: Attach values and metadata
         hierarchy = self.attach_values(hierarchy, filing_data['num'],
-                                       filing_data['tag'], filing_data['sub'], stmt_type)
+                                       filing_data['tag'], filing_data['sub'], stmt_type,
+                                       nodes_by_tag=nodes_by_tag)
 
         # Step 4: Validate
         validation = self.validate_rollups(hierarchy)
@@ -1046,69 +1684,29 @@ class StatementReconstructor:
         calc_graph = {}
         calc_source = None
         try:
-            from xbrl_loader import load_calc_graph_with_fallback
             calc_graph, calc_source = load_calc_graph_with_fallback(cik, adsh, verbose=self.verbose)
             marked_count = self._mark_sum_items(hierarchy, calc_graph)
-            self._log(f"  Calc graph loaded ({calc_source}): {len(calc_graph)} parent tags, {marked_count} nodes marked as sum items")
+            self._log("  Calc graph loaded (%s): %d parent tags, %d nodes marked as sum items",
+                      calc_source, len(calc_graph), marked_count)
         except Exception as e:
-            self._log(f"  Warning: Could not load calc graph: {e}")
+            self._log("  Warning: Could not load calc graph: %s", e)
 
         # Step 6: Create flat list with full metadata for each line item
         line_items = []
 
-        def flatten_recursive(node: StatementNode):
-            """Extract all line items with full metadata"""
-            # Skip virtual root nodes
-            if node.tag.endswith('_ROOT'):
-                for child in node.children:
-                    flatten_recursive(child)
-                return
-
-            # Only include nodes with values
-            if node.value is not None:
-                line_items.append({
-                    # Core identification
-                    'tag': node.tag,
-                    'plabel': node.plabel,
-
-                    # PRE table fields
-                    'stmt': node.stmt,
-                    'report': node.report,
-                    'line': node.line,
-                    'stmt_order': node.line,  # For section classification
-                    'inpth': node.level,
-                    'negating': node.negating,
-
-                    # NUM table fields
-                    'value': node.value,
-                    'ddate': node.ddate,
-                    'qtrs': node.qtrs,
-                    'uom': node.uom,
-                    'segments': node.segments,
-                    'coreg': node.coreg,
-
-                    # TAG table fields
-                    'custom': node.custom,
-                    'tlabel': node.tlabel,
-                    'datatype': node.datatype,
-                    'iord': node.iord,
-                    'crdr': node.crdr,
-
-                    # Calc graph fields (from XBRL calculation linkbase)
-                    'is_sum': node.is_sum,
-                    'calc_children': node.calc_children if node.is_sum else [],
-
-                    # Parent info (for skip logic - to check if parent is a control item)
-                    'parent_line': node.parent.line if node.parent and not node.parent.tag.endswith('_ROOT') else None,
-                })
-
-            for child in node.children:
-                flatten_recursive(child)
-
-        flatten_recursive(hierarchy)
-
-        # Sort by line number to maintain presentation order
-        line_items.sort(key=lambda x: x['line'] if x['line'] is not None else 0)
+        # Prepass: only nodes with values (virtual roots never have one)
+        valued_nodes = [node for node in self._iter_nodes(hierarchy)
+                        if node.value is not None and not node.tag.endswith('_ROOT')]
+
+        for node in valued_nodes:
+            # Parent info (for skip logic - to check if parent is a control item)
+            parent = node.parent
+            parent_line = parent.line if parent and not parent.tag.endswith('_ROOT') else None
+            line_items.append(self._line_item(node, parent_line))
+
+        # Sort by line number to maintain presentation order ('line' is never
+        # None, see _line_item, so the key can stay in C)
+        line_items.sort(key=itemgetter('line'))
 
         # Also create simple tag->value dict for backward compatibility
         flat_data = {item['tag']: item['value'] for item in line_items}
@@ -1117,9 +1715,8 @@ class StatementReconstructor:
         cik_padded = str(cik).zfill(10)
         edgar_url = f"https://www.sec.gov/cgi-bin/viewer?action=view&cik={cik_padded}&accession_number={adsh}&xbrl_type=v"
 
-        self._log(f"\nReconstruction complete!")
-        self._log(f"  Total line items: {len(line_items)}")
-        self._log(f"  EDGAR viewer: {edgar_url}")
+        self._log("\nReconstruction complete!\n  Total line items: %d\n  EDGAR viewer: %s",
+                  len(line_items), edgar_url)
 
         return {
             'hierarchy': hierarchy,
@@ -1163,16 +1760,16 @@ class StatementReconstructor:
                 - 'line_items': List of dicts with multi-period values
                 - 'metadata': Filing metadata
         """
-        self._log(f"\n{'='*60}")
-        self._log(f"Reconstructing {stmt_type} statement (MULTI-PERIOD)")
-        self._log(f"CIK: {cik}, ADSH: {adsh}")
-        self._log(f"{'='*60}")
+        self._log("\n%s\nReconstructing %s statement (MULTI-PERIOD)\nCIK: %s, ADSH: %s\n%s",
+                  _RULE, stmt_type, cik, adsh, _RULE)
 
-        # Step 1: Load filing data
-        filing_data = self.load_filing_data(adsh)
+        # Step 1: Load filing data (reused if the last call was for this filing)
+        filing_data = self._get_filing_data(adsh)
 
-        # Step 2: Build hierarchy (structure - same for all periods)
-        hierarchy = self.build_hierarchy(filing_data['pre'], stmt_type)
+        # Step 2: Build hierarchy (structure - same for all periods), with
+        # TAG metadata (iord, crdr, ...) set as the nodes are created
+        hierarchy, nodes_by_tag = self._build_hierarchy(filing_data['pre'], stmt_type,
+                                                        tag_df=filing_data['tag'])
 
         if hierarchy is None:
             return {
@@ -1184,8 +1781,6 @@ class StatementReconstructor:
             }
 
         # Step 3: Discover periods using representative tag approach
-        from period_discovery import PeriodDiscovery
-
         discoverer = PeriodDiscovery()
         periods = discoverer.discover_periods(
             filing_data['pre'],
@@ -1194,266 +1789,171 @@ class StatementReconstructor:
             stmt_type
         )
 
-        self._log(f"\nDiscovered {len(periods)} periods:")
+        self._log("\nDiscovered %d periods:", len(periods))
         for p in periods:
-            self._log(f"  - {p['label']} (ddate={p['ddate']}, qtrs={p['qtrs']})")
-
-        # Step 4: Attach metadata from TAG table (do once)
-        # This sets iord, crdr, etc. which don't change across periods
-        def attach_tag_metadata(node: StatementNode):
-            """Attach TAG metadata to node"""
-            tag_row = filing_data['tag'][filing_data['tag']['tag'] == node.tag]
-            if len(tag_row) > 0:
-                row = tag_row.iloc[0]
-                node.custom = row.get('custom')
-                node.tlabel = row.get('tlabel')
-                node.datatype = row.get('datatype')
-                node.iord = row.get('iord')
-                node.crdr = row.get('crdr')
-
-            for child in node.children:
-                attach_tag_metadata(child)
-
-        attach_tag_metadata(hierarchy)
-
-        # Step 5: For each period, attach values
-        for period in periods:
-            self.attach_values_for_period(
-                hierarchy,
-                filing_data['num'],
-                filing_data['tag'],
-                period,
-                stmt_type
-            )
+            self._log("  - %s (ddate=%s, qtrs=%s)", p['label'], p['ddate'], p['qtrs'])
 
-        # Step 5b: Load calc graph and mark sum items
+        # Consolidated instant dates: used for beginning-balance inference
+        # while attaching and again when matching values to periods below
+        instant_dates = self._instant_dates(filing_data['num'])
+
+        # Step 4: Attach values for all periods (one pass over the nodes)
+        self.attach_values_for_periods(
+            hierarchy,
+            filing_data['num'],
+            filing_data['tag'],
+            periods,
+            stmt_type,
+            nodes_by_tag=nodes_by_tag,
+            instant_dates=instant_dates
+        )
+
+        # Step 4b: Load calc graph and mark sum items. The same pass builds
+        # the reverse lookup from calc_children: child_tag -> parent_line,
+        # i.e. for each tag, its calc graph parent's line number
         calc_graph = {}
         calc_source = None
+        calc_parent_lookup = {}  # child_tag (lowercase) -> parent_line
         try:
-            from xbrl_loader import load_calc_graph_with_fallback
             calc_graph, calc_source = load_calc_graph_with_fallback(cik, adsh, verbose=self.verbose)
-            marked_count = self._mark_sum_items(hierarchy, calc_graph)
-            self._log(f"  Calc graph loaded ({calc_source}): {len(calc_graph)} parent tags, {marked_count} nodes marked as sum items")
+            marked_count = self._mark_sum_items(hierarchy, calc_graph,
+                                                calc_parent_lookup=calc_parent_lookup)
+            self._log("  Calc graph loaded (%s): %d parent tags, %d nodes marked as sum items",
+                      calc_source, len(calc_graph), marked_count)
         except Exception as e:
-            self._log(f"  Warning: Could not load calc graph: {e}")
+            self._log("  Warning: Could not load calc graph: %s", e)
 
-        # Step 5c: Build reverse lookup from calc_children: child_tag -> parent_line
-        # This tells us for each tag, what is its calc graph parent's line number
-        calc_parent_lookup = {}  # child_tag (lowercase) -> parent_line
+        # Step 5: Create line_items with multi-period values
+        line_items = []
 
-        def build_calc_parent_lookup(node: StatementNode):
-            """Build reverse lookup from calc_children to find calc graph parent"""
-            if node.is_sum and node.calc_children:
-                parent_line = node.line
-                for child_entry in node.calc_children:
-                    # child_entry is (child_tag, weight, plabel) or (child_tag, weight)
-                    if isinstance(child_entry, (list, tuple)) and len(child_entry) >= 1:
-                        child_tag = child_entry[0]
-                        # Normalize tag: remove prefix like 'us-gaap_'
-                        if '_' in child_tag:
-                            child_tag = child_tag.split('_', 1)[1]
-                        child_tag_lower = child_tag.lower()
-                        # If this child already has a parent assigned, prefer the one with greater line number
-                        # Greater line numbers are typically higher-level control items (e.g., Total Assets)
-                        # This handles cases where an item appears under multiple parents in calc graph
-                        if child_tag_lower in calc_parent_lookup:
-                            existing_parent_line = calc_parent_lookup[child_tag_lower]
-                            if parent_line > existing_parent_line:
-                                calc_parent_lookup[child_tag_lower] = parent_line
-                        else:
-                            calc_parent_lookup[child_tag_lower] = parent_line
-            for child in node.children:
-                build_calc_parent_lookup(child)
+        # Get available instant dates for beginning balance matching
+        available_instant_dates = list(instant_dates)
+
+        # Expected beginning date of each duration period, computed once per
+        # period rather than per node (with its day ordinal for the 5-day test)
+        expected_beginning = {}
+        for i, period in enumerate(periods):
+            if period['qtrs'] != '0':
+                expected_date = discoverer.infer_beginning_ddate(
+                    period['ddate'],
+                    period['qtrs'],
+                    available_instant_dates
+                )
+                expected_beginning[i] = (expected_date, _ddate_ordinal(expected_date))
 
-        build_calc_parent_lookup(hierarchy)
+        def closest_instant(ordinals: List[int], node_instants: List[Tuple[int, int, float]],
+                            expected_ordinal: Optional[int]) -> Optional[float]:
+            """
+            Stored instant value closest to the expected date, if within 5 days
+            (first one wins on ties, in node.values order)
 
-        # Step 6: Create line_items with multi-period values
-        line_items = []
+            node_instants is sorted by (day ordinal, position in node.values)
+            and ordinals holds its first column, so only the nearest date on
+            each side of the expected one needs checking.
+            """
+            if expected_ordinal is None:
+                return None
+            idx = bisect_left(ordinals, expected_ordinal)
+            candidates = []
+            if idx > 0:
+                # First entry of the closest earlier date
+                candidates.append(node_instants[bisect_left(ordinals, ordinals[idx - 1])])
+            if idx < len(ordinals):
+                candidates.append(node_instants[idx])
+            best_match = None
+            best_key = None
+            for stored_ordinal, position, stored_value in candidates:
+                diff_days = abs(stored_ordinal - expected_ordinal)
+                # Accept if within 5 days of expected
+                if diff_days <= 5 and (best_key is None or (diff_days, position) < best_key):
+                    best_key = (diff_days, position)
+                    best_match = stored_value
+            return best_match
+
+        # Prepass: only nodes that have values in ANY period, virtual roots
+        # skipped, so the per-period matching below never sees empty nodes
+        valued_nodes = [node for node in self._iter_nodes(hierarchy)
+                        if node.values and not node.tag.endswith('_ROOT')]
+
+        # Extract line items with multi-period values
+        for node in valued_nodes:
+            # Beginning balance flag is computed once at construction
+            is_beginning_node = node.is_beginning
+            node_values = node.values
+
+            # This node's instant values as (day ordinal, position, value)
+            # sorted by date, built on first use; unparseable dates are left out
+            node_instants = None
+            instant_ordinals = None
+
+            # Build values dict for this line item
+            period_values = {}
+            for i, period in enumerate(periods):
+                period_ddate = period['ddate']
+                period_qtrs = period['qtrs']
+
+                # Find value for this period
+                # For most items: direct match on (ddate, qtrs)
+                # For instant items (qtrs=0) in duration statements: match to period by ddate
+                value = None
+                use_beginning = False
+
+                # First, try direct match
+                if (period_ddate, period_qtrs) in node_values:
+                    value = node_values[(period_ddate, period_qtrs)]
+
+                # For BEGINNING balance nodes, skip instant match and go straight to
+                # expected beginning date calculation (because stored dates are inferred, not period dates)
+                elif is_beginning_node and node.iord == 'I' and period_qtrs != '0':
+                    use_beginning = True
+                else:
+                    # For ENDING balance, other instant items, and all duration items
+                    # Look for instant values (qtrs='0') matching this period's ddate
+                    value = node_values.get((period_ddate, '0'))
 
-        # Get available instant dates for beginning balance matching
-        available_instant_dates = filing_data['num'][
-            (filing_data['num']['qtrs'] == '0') &
-            (filing_data['num']['segments'].isna()) &
-            (filing_data['num']['coreg'].isna())
-        ]['ddate'].unique().tolist()
-        available_instant_dates = sorted(available_instant_dates)
-
-        def flatten_multi_period(node: StatementNode):
-            """Extract line items with multi-period values"""
-            # Skip virtual root nodes
-            if node.tag.endswith('_ROOT'):
-                for child in node.children:
-                    flatten_multi_period(child)
-                return
-
-            # Include nodes that have values in ANY period
-            if len(node.values) > 0:
-                # Check if this node is a beginning balance (do once per node)
-                is_beginning_node = False
-                if node.plabel:
-                    plabel_lower = node.plabel.lower()
-                    # More flexible detection: just need 'beginning' keyword
-                    # Examples: "beginning balances", "beginning of period", "beginning of year"
-                    is_beginning_node = 'beginning' in plabel_lower
-
-                # Build values dict for this line item
-                period_values = {}
-                for period in periods:
-                    period_ddate = period['ddate']
-                    period_qtrs = period['qtrs']
-
-                    # Find value for this period
-                    # For most items: direct match on (ddate, qtrs)
-                    # For instant items (qtrs=0) in duration statements: match to period by ddate
-                    value = None
-
-                    # First, try direct match
-                    if (period_ddate, period_qtrs) in node.values:
-                        value = node.values[(period_ddate, period_qtrs)]
-
-                    # For BEGINNING balance nodes, skip instant match and go straight to
-                    # expected beginning date calculation (because stored dates are inferred, not period dates)
-                    elif is_beginning_node and node.iord == 'I' and period_qtrs != '0':
-                        # Calculate expected beginning date for this period
-                        expected_beginning_date = discoverer.infer_beginning_ddate(
-                            period_ddate,
-                            period_qtrs,
-                            available_instant_dates
-                        )
-
-                        # Look for exact match first
-                        if (expected_beginning_date, '0') in node.values:
-                            value = node.values[(expected_beginning_date, '0')]
-                        else:
-                            # If no exact match, find closest instant date
-                            best_match = None
-                            min_diff_days = float('inf')
-
-                            for (stored_ddate, stored_qtrs), stored_value in node.values.items():
-                                if stored_qtrs == '0':
-                                    # Calculate actual day difference
-                                    from datetime import datetime
-                                    try:
-                                        expected_dt = datetime.strptime(expected_beginning_date, '%Y%m%d')
-                                        stored_dt = datetime.strptime(stored_ddate, '%Y%m%d')
-                                        diff_days = abs((stored_dt - expected_dt).days)
-
-                                        # Accept if within 5 days of expected
-                                        if diff_days < min_diff_days and diff_days <= 5:
-                                            min_diff_days = diff_days
-                                            best_match = stored_value
-                                    except:
-                                        pass
-
-                            if best_match is not None:
-                                value = best_match
+                    # For instant items that are NOT beginning balances
+                    # (fallback for edge cases)
+                    use_beginning = (value is None and node.iord == 'I' and period_qtrs != '0'
+                                     and not is_beginning_node)
+
+                if use_beginning:
+                    expected_beginning_date, expected_ordinal = expected_beginning[i]
 
+                    # Look for exact match first
+                    if (expected_beginning_date, '0') in node_values:
+                        value = node_values[(expected_beginning_date, '0')]
                     else:
-                        # For ENDING balance, other instant items, and all duration items
-                        # Look for instant values (qtrs='0') matching this period's ddate
-                        for (stored_ddate, stored_qtrs), stored_value in node.values.items():
-                            if stored_qtrs == '0' and stored_ddate == period_ddate:
-                                value = stored_value
-                                break
-
-                        # For instant items that are NOT beginning balances
-                        # (fallback for edge cases)
-                        if value is None and node.iord == 'I' and period_qtrs != '0' and not is_beginning_node:
-                            # This is an instant item in a duration period (likely beginning balance)
-                            # Calculate expected beginning date using same logic as attach_values_for_period
-                            expected_beginning_date = discoverer.infer_beginning_ddate(
-                                period_ddate,
-                                period_qtrs,
-                                available_instant_dates
+                        # If no exact match, find closest instant date
+                        # (in case rounding caused slight difference)
+                        if node_instants is None:
+                            node_instants = sorted(
+                                (ordinal, position, stored_value)
+                                for position, ((stored_ddate, stored_qtrs), stored_value)
+                                in enumerate(node_values.items())
+                                if stored_qtrs == '0'
+                                and (ordinal := _ddate_ordinal(stored_ddate)) is not None
                             )
+                            instant_ordinals = [entry[0] for entry in node_instants]
+                        value = closest_instant(instant_ordinals, node_instants, expected_ordinal)
 
-                            # Look for exact match first
-                            if (expected_beginning_date, '0') in node.values:
-                                value = node.values[(expected_beginning_date, '0')]
-                            else:
-                                # If no exact match, find closest instant date
-                                # (in case rounding caused slight difference)
-                                best_match = None
-                                min_diff_days = float('inf')
-
-                                for (stored_ddate, stored_qtrs), stored_value in node.values.items():
-                                    if stored_qtrs == '0':
-                                        # Calculate actual day difference
-                                        from datetime import datetime
-                                        try:
-                                            expected_dt = datetime.strptime(expected_beginning_date, '%Y%m%d')
-                                            stored_dt = datetime.strptime(stored_ddate, '%Y%m%d')
-                                            diff_days = abs((stored_dt - expected_dt).days)
-
-                                            # Accept if within 5 days of expected
-                                            if diff_days < min_diff_days and diff_days <= 5:
-                                                min_diff_days = diff_days
-                                                best_match = stored_value
-                                        except:
-                                            pass
-
-                                if best_match is not None:
-                                    value = best_match
-
-                    if value is not None:
-                        period_values[period['label']] = value
-
-                line_items.append({
-                    # Core identification
-                    'tag': node.tag,
-                    'plabel': node.plabel,
-
-                    # PRE table fields
-                    'stmt': node.stmt,
-                    'report': node.report,
-                    'line': node.line,
-                    'stmt_order': node.line,  # For section classification
-                    'inpth': node.level,
-                    'negating': node.negating,
-
-                    # Multi-period values
-                    'values': period_values,  # Dict: {period_label: value}
-
-                    # Backward compatibility - last period
-                    'value': node.value,
-                    'ddate': node.ddate,
-                    'qtrs': node.qtrs,
-                    'uom': node.uom,
-                    'segments': node.segments,
-                    'coreg': node.coreg,
-
-                    # TAG table fields
-                    'custom': node.custom,
-                    'tlabel': node.tlabel,
-                    'datatype': node.datatype,
-                    'iord': node.iord,
-                    'crdr': node.crdr,
-
-                    # Calc graph fields (from XBRL calculation linkbase)
-                    'is_sum': node.is_sum,
-                    'calc_children': node.calc_children if node.is_sum else [],
-
-                    # Parent info from CALC GRAPH (for skip logic - to check if parent is a mapped item)
-                    # This is the calc graph parent, NOT the presentation hierarchy parent
-                    'parent_line': calc_parent_lookup.get(node.tag.lower()),
-                })
-
-            for child in node.children:
-                flatten_multi_period(child)
-
-        flatten_multi_period(hierarchy)
-
-        # Sort by line number to maintain presentation order
-        line_items.sort(key=lambda x: x['line'] if x['line'] is not None else 0)
+                if value is not None:
+                    period_values[period['label']] = value
+
+            # Parent info from CALC GRAPH (for skip logic - to check if parent is a mapped item)
+            # This is the calc graph parent, NOT the presentation hierarchy parent
+            line_items.append(self._line_item(node, calc_parent_lookup.get(node.tag.lower()),
+                                              period_values))
+
+        # Sort by line number to maintain presentation order ('line' is never
+        # None, see _line_item, so the key can stay in C)
+        line_items.sort(key=itemgetter('line'))
 
         # Generate EDGAR viewer URL
         cik_padded = str(cik).zfill(10)
         edgar_url = f"https://www.sec.gov/cgi-bin/viewer?action=view&cik={cik_padded}&accession_number={adsh}&xbrl_type=v"
 
-        self._log(f"\nMulti-period reconstruction complete!")
-        self._log(f"  Total line items: {len(line_items)}")
-        self._log(f"  Periods: {len(periods)}")
-        self._log(f"  EDGAR viewer: {edgar_url}")
+        self._log("\nMulti-period reconstruction complete!\n  Total line items: %d\n"
+                  "  Periods: %d\n  EDGAR viewer: %s", len(line_items), len(periods), edgar_url)
 
         return {
             'hierarchy': hierarchy,
@@ -1478,20 +1978,183 @@ class StatementReconstructor:
             node: Root node to print
             max_depth: Maximum depth to print (avoid too much output)
         """
-        def print_recursive(n: StatementNode, depth: int = 0):
+        # Collect lines and write once instead of one print() per node
+        lines = []
+        stack = [(node, 0)]
+        while stack:
+            n, depth = stack.pop()
             if depth > max_depth:
-                return
+                continue
 
             indent = "  " * depth
             value_str = f"${n.value:,.0f}" if n.value else "N/A"
             negating_str = " (subtract)" if n.negating else ""
 
-            print(f"{indent}{n.plabel}: {value_str}{negating_str}")
+            lines.append(f"{indent}{n.plabel}: {value_str}{negating_str}")
+
+            stack.extend((child, depth + 1) for child in reversed(n.children))
 
-            for child in n.children:
-                print_recursive(child, depth + 1)
+        if lines:
+            print("\n".join(lines))
 
-        print_recursive(node)
+    def reconstruct_all_statements(self, cik: int, adsh: str,
+                                   stmt_types: Tuple[str, ...] = ('BS', 'IS', 'CF', 'EQ'),
+                                   multi_period: bool = False,
+                                   workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Reconstruct several statements of one filing, sharing its data
+
+        The filing and its calc graph are loaded once, up front; the
+        statements are then built on a thread pool. Warming the calc graph
+        first matters: its lru_cache does not serialize concurrent misses,
+        so cold threads would all fetch it and race on the xbrl_loader disk
+        cache. Each statement gets its own tree and the shared filing frames
+        and calc graph are only read. If the calc graph cannot be loaded the
+        statements run one at a time (each retries it, as a single call does).
+
+        Args:
+            cik: Company CIK
+            adsh: Accession number
+            stmt_types: Statement types to reconstruct
+            multi_period: Use reconstruct_statement_multi_period instead
+            workers: Number of threads (default: one per statement type)
+
+        Returns:
+            {stmt_type: result dict}. Failures are returned as
+            {'error': ..., 'metadata': {...}} instead of raising.
+        """
+        self._get_filing_data(adsh)
+        try:
+            load_calc_graph_with_fallback(cik, adsh, verbose=self.verbose)
+        except Exception as e:
+            self._log("  Warning: Could not load calc graph: %s", e)
+            workers = 1
+        reconstruct = self.reconstruct_statement_multi_period if multi_period else self.reconstruct_statement
+
+        def run(stmt_type: str) -> Dict:
+            try:
+                return reconstruct(cik, adsh, stmt_type)
+            except Exception as e:
+                return {
+                    'error': str(e),
+                    'hierarchy': None,
+                    'metadata': {'cik': cik, 'adsh': adsh, 'stmt_type': stmt_type}
+                }
+
+        with ThreadPoolExecutor(max_workers=workers or len(stmt_types) or 1) as pool:
+            return dict(zip(stmt_types, pool.map(run, stmt_types)))
+
+    def reconstruct_batch(self, filings: List[Tuple[int, str]], stmt_type: str = 'BS',
+                          workers: Optional[int] = None, multi_period: bool = False) -> List[Dict]:
+        """
+        Reconstruct one statement for many filings in parallel worker processes
+
+        In file mode the quarter's tables are loaded (and indexed by adsh) here
+        first, which also writes the Parquet snapshots. On Linux the workers
+        are forked and inherit the tables copy-on-write; elsewhere (spawn,
+        as fork is unsafe on macOS) they read only their filings' rows from
+        the adsh-sorted snapshots instead of re-parsing whole tables. Each worker builds its own
+        reconstructor (and DB engine) once.
+
+        Args:
+            filings: List of (cik, adsh) pairs
+            stmt_type: Statement type ('BS', 'IS', 'CF', 'EQ')
+            workers: Number of processes (default: CPU count)
+            multi_period: Use reconstruct_statement_multi_period instead
+
+        Returns:
+            One result dict per filing, in input order. 'hierarchy' is dropped
+            (None) to keep results cheap to send back; failures are returned
+            as {'error': ..., 'metadata': {...}} instead of raising.
+        """
+        if not self.use_db:
+            for table_name in ('pre', 'num', 'tag', 'sub'):
+                self._load_table(table_name)
+
+        mp_context = None
+        if sys.platform.startswith('linux'):
+            mp_context = multiprocessing.get_context('fork')
+        filtered_reads = not self.use_db and mp_context is None
+
+        workers = workers or os.cpu_count() or 1
+        tasks = [(cik, adsh, stmt_type, multi_period) for cik, adsh in filings]
+
+        # A few chunks per worker: amortizes IPC without starving the tail
+        chunksize = max(1, len(tasks) // (4 * workers))
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=_init_batch_worker,
+                                 initargs=(self.year, self.quarter, self.use_db, self.verbose,
+                                           filtered_reads)) as pool:
+            return list(pool.map(_reconstruct_in_worker, tasks, chunksize=chunksize))
+
+
+# Per-process reconstructor used by reconstruct_batch workers
+_WORKER_RECONSTRUCTOR: Optional[StatementReconstructor] = None
+
+
+def _init_batch_worker(year: int, quarter: int, use_db: bool, verbose: bool,
+                       filtered_reads: bool = False):
+    """ProcessPoolExecutor initializer: build this worker's reconstructor"""
+    global _WORKER_RECONSTRUCTOR
+    _WORKER_RECONSTRUCTOR = StatementReconstructor(year, quarter, use_db=use_db, verbose=verbose)
+    _WORKER_RECONSTRUCTOR._filtered_reads = filtered_reads
+
+
+def _reconstruct_in_worker(task: Tuple[int, str, str, bool]) -> Dict:
+    """Reconstruct one (cik, adsh) in a worker and drop the tree before returning"""
+    cik, adsh, stmt_type, multi_period = task
+    try:
+        if multi_period:
+            result = _WORKER_RECONSTRUCTOR.reconstruct_statement_multi_period(cik, adsh, stmt_type)
+        else:
+            result = _WORKER_RECONSTRUCTOR.reconstruct_statement(cik, adsh, stmt_type)
+    except Exception as e:
+        return {
+            'error': str(e),
+            'hierarchy': None,
+            'metadata': {'cik': cik, 'adsh': adsh, 'stmt_type': stmt_type}
+        }
+
+    result['hierarchy'] = None
+    return result
+
+
+@functools.lru_cache(maxsize=16)
+def _load_sub_index(year: int, quarter: int) -> pd.Series:
+    """
+    Read SUB once per quarter: first ADSH per CIK (file order, most recent first)
+
+    Returns:
+        Series of adsh indexed by int cik
+    """
+    sub_path = config.storage.extracted_dir / f'{year}q{quarter}' / 'sub.txt'
+    sub_df = pd.read_csv(sub_path, sep='\t', usecols=['adsh', 'cik'], dtype=str)
+    sub_df['cik'] = sub_df['cik'].astype(int)
+    return sub_df.groupby('cik', sort=False)['adsh'].first()
+
+
+def get_adsh_for_companies(ciks: List[int], year: int, quarter: int) -> Dict[int, str]:
+    """
+    Helper: Find ADSH for many companies in a specific quarter
+
+    Args:
+        ciks: Company CIKs
+        year: Year
+        quarter: Quarter (1-4)
+
+    Returns:
+        Dict {cik: adsh} for the CIKs that have a filing (others are omitted)
+    """
+    sub_path = config.storage.extracted_dir / f'{year}q{quarter}' / 'sub.txt'
+
+    if not sub_path.exists():
+        print(f"Error: {sub_path} not found")
+        return {}
+
+    adsh_by_cik = _load_sub_index(year, quarter)
+    hits = adsh_by_cik.reindex(pd.Index([int(cik) for cik in ciks]).unique()).dropna()
+    return hits.to_dict()
 
 
 def get_adsh_for_company(cik: int, year: int, quarter: int) -> Optional[str]:
@@ -1512,17 +2175,14 @@ def get_adsh_for_company(cik: int, year: int, quarter: int) -> Optional[str]:
         print(f"Error: {sub_path} not found")
         return None
 
-    sub_df = pd.read_csv(sub_path, sep='\t', dtype=str)
-    sub_df['cik'] = sub_df['cik'].astype(int)
-
-    matches = sub_df[sub_df['cik'] == cik]
+    # Return first match (most recent if multiple)
+    adsh = _load_sub_index(year, quarter).get(int(cik))
 
-    if len(matches) == 0:
+    if adsh is None:
         print(f"No filing found for CIK {cik} in {year}Q{quarter}")
         return None
 
-    # Return first match (most recent if multiple)
-    return matches.iloc[0]['adsh']
+    return adsh
 
 
 if __name__ == '__main__':
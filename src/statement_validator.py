@@ -11,30 +11,327 @@ These validations work for flat statements (most common in EDGAR data)
 and provide stronger guarantees than just parent-child rollup validation.
 """
 
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from math import fabs
+from typing import ClassVar, Dict, Final, Iterator, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, field
+
+
+# Every tag the validators read; the batch path stores one column per tag
+_TAG_COLUMNS: Tuple[str, ...] = (
+    # Balance Sheet
+    'Assets',
+    'Liabilities',
+    'StockholdersEquity',
+    'LiabilitiesAndStockholdersEquity',
+    'AssetsCurrent',
+    'AssetsNoncurrent',
+    'LiabilitiesCurrent',
+    'LiabilitiesNoncurrent',
+    # Income Statement
+    'Revenues',
+    'RevenueFromContractWithCustomerExcludingAssessedTax',
+    'SalesRevenueNet',
+    'CostOfRevenue',
+    'CostOfGoodsAndServicesSold',
+    'CostOfSales',
+    'GrossProfit',
+    'OperatingIncomeLoss',
+    'OperatingIncome',
+    'OperatingExpenses',
+    'IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest',
+    'IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments',
+    'IncomeLossBeforeIncomeTaxes',
+    'IncomeTaxExpenseBenefit',
+    'IncomeTaxesPaid',
+    'NetIncomeLoss',
+    'NetIncome',
+    'ProfitLoss',
+    'IncomeLossFromEquityMethodInvestments',
+    # Cash Flow
+    'NetCashProvidedByUsedInOperatingActivities',
+    'NetCashProvidedByUsedInOperatingActivitiesContinuingOperations',
+    'NetCashProvidedByUsedInInvestingActivities',
+    'NetCashProvidedByUsedInInvestingActivitiesContinuingOperations',
+    'NetCashProvidedByUsedInFinancingActivities',
+    'NetCashProvidedByUsedInFinancingActivitiesContinuingOperations',
+    'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsPeriodIncreaseDecreaseIncludingExchangeRateEffect',
+    'CashAndCashEquivalentsPeriodIncreaseDecrease',
+    'EffectOfExchangeRateOnCashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents',
+    'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsBeginningOfPeriod',
+    'CashAndCashEquivalentsAtCarryingValueBeginningOfPeriod',
+    'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsEndOfPeriod',
+    'CashAndCashEquivalentsAtCarryingValue',
+)
+
+# Column of each tag in the batch array (built once at import)
+_TAG_INDEX: Dict[str, int] = {tag: i for i, tag in enumerate(_TAG_COLUMNS)}
+
+@dataclass(frozen=True)
+class _Equation:
+    """
+    One accounting identity checked by the validators: left = sum of terms
+
+    Items (left, terms, optional) are tags, or keys of
+    StatementValidator._TAG_ALIASES for line items with fallback tags.
+    Equations sharing a name are alternatives: only the first one whose
+    values are all present is checked.
+    """
+    statement: str                      # 'BS', 'IS' or 'CF'
+    key: str                            # Field prefix in the batch result
+    name: str                           # One of _ALL_EQUATIONS
+    label: str                          # 'equation' of the failure dict
+    left: str
+    terms: Tuple[Tuple[int, str], ...]  # (+1 / -1, item), all required
+    optional: Tuple[str, ...] = ()      # Added if present (taken as 0 otherwise)
+    if_missing: Optional[str] = None    # Warning if no alternative was checked
+
+
+# Equation names (entries of equations_checked / equations_passed); every
+# result refers to these same string objects
+EQ_BS_MAIN: Final[str] = 'Assets = Liabilities + Equity'
+EQ_BS_ASSETS: Final[str] = 'Assets = Current + Noncurrent'
+EQ_BS_LIABILITIES: Final[str] = 'Liabilities = Current + Noncurrent'
+EQ_IS_GROSS_PROFIT: Final[str] = 'Gross Profit = Revenue - Cost of Revenue'
+EQ_IS_OPERATING_INCOME: Final[str] = 'Operating Income = Gross Profit - Operating Expenses'
+EQ_IS_NET_INCOME: Final[str] = 'Net Income = Income Before Tax - Tax'
+EQ_CF_CHANGE_IN_CASH: Final[str] = 'Operating + Investing + Financing = Change in Cash'
+EQ_CF_ENDING_CASH: Final[str] = 'Beginning Cash + Change = Ending Cash'
+
+# Canonical order of the names; bit i of ValidationResult.passed_mask is _ALL_EQUATIONS[i]
+_ALL_EQUATIONS: Tuple[str, ...] = (
+    EQ_BS_MAIN,
+    EQ_BS_ASSETS,
+    EQ_BS_LIABILITIES,
+    EQ_IS_GROSS_PROFIT,
+    EQ_IS_OPERATING_INCOME,
+    EQ_IS_NET_INCOME,
+    EQ_CF_CHANGE_IN_CASH,
+    EQ_CF_ENDING_CASH,
+)
+_EQUATION_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(_ALL_EQUATIONS)}
+
+_BS_MAIN_MISSING = 'Cannot validate main equation: missing Assets, Liabilities, or Equity'
+
+# Every equation, in check order per statement
+_EQUATIONS: Tuple[_Equation, ...] = (
+    # Balance Sheet
+    _Equation('BS', 'bs_main', EQ_BS_MAIN,
+              'Assets = LiabilitiesAndStockholdersEquity',
+              'Assets', ((1, 'LiabilitiesAndStockholdersEquity'),),
+              if_missing=_BS_MAIN_MISSING),
+    _Equation('BS', 'bs_main', EQ_BS_MAIN,
+              'Assets = Liabilities + StockholdersEquity',
+              'Assets', ((1, 'Liabilities'), (1, 'StockholdersEquity')),
+              if_missing=_BS_MAIN_MISSING),
+    _Equation('BS', 'bs_assets', EQ_BS_ASSETS,
+              'Assets = AssetsCurrent + AssetsNoncurrent',
+              'Assets', ((1, 'AssetsCurrent'), (1, 'AssetsNoncurrent'))),
+    _Equation('BS', 'bs_liabilities', EQ_BS_LIABILITIES,
+              'Liabilities = LiabilitiesCurrent + LiabilitiesNoncurrent',
+              'Liabilities', ((1, 'LiabilitiesCurrent'), (1, 'LiabilitiesNoncurrent'))),
+    # Income Statement
+    _Equation('IS', 'is_gross_profit', EQ_IS_GROSS_PROFIT,
+              'GrossProfit = Revenue - CostOfRevenue',
+              'GrossProfit', ((1, 'revenue'), (-1, 'cost_of_revenue'))),
+    _Equation('IS', 'is_operating_income', EQ_IS_OPERATING_INCOME,
+              'OperatingIncome = GrossProfit - OperatingExpenses',
+              'operating_income', ((1, 'GrossProfit'), (-1, 'OperatingExpenses'))),
+    # Equity method investments adjust net income when reported
+    _Equation('IS', 'is_net_income', EQ_IS_NET_INCOME,
+              'NetIncome = IncomeBeforeTax - Tax + EquityMethod',
+              'net_income', ((1, 'income_before_tax'), (-1, 'tax_expense')),
+              optional=('IncomeLossFromEquityMethodInvestments',)),
+    # Cash Flow
+    _Equation('CF', 'cf_change_in_cash', EQ_CF_CHANGE_IN_CASH,
+              'ChangeInCash = Operating + Investing + Financing + FX',
+              'change_in_cash', ((1, 'operating_cf'), (1, 'investing_cf'), (1, 'financing_cf')),
+              optional=('EffectOfExchangeRateOnCashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents',)),
+    _Equation('CF', 'cf_ending_cash', EQ_CF_ENDING_CASH,
+              'EndingCash = BeginningCash + Change',
+              'ending_cash', ((1, 'beginning_cash'), (1, 'change_in_cash'))),
+)
+
+_EQUATIONS_BY_STATEMENT: Dict[str, Tuple[_Equation, ...]] = {
+    stmt: tuple(eq for eq in _EQUATIONS if eq.statement == stmt) for stmt in ('BS', 'IS', 'CF')
+}
+
+_STATEMENT_TYPES = {
+    'BS': 'Balance Sheet',
+    'IS': 'Income Statement',
+    'CF': 'Cash Flow Statement',
+}
+
+# Warnings for a statement where no equation could be checked
+_NO_EQUATION_WARNINGS: Dict[str, Tuple[str, ...]] = {
+    'BS': (),
+    'IS': ('Cannot validate income statement: missing required tags',
+           'Looking for: Revenue, Cost of Revenue, Operating Income, Net Income'),
+    'CF': ('Cannot validate cash flow statement: missing required tags',
+           'Looking for: Operating CF, Investing CF, Financing CF, Change in Cash'),
+}
+
+# Equations evaluated by validate_all_statements_batch: (statement, key)
+BATCH_EQUATIONS = list(dict.fromkeys((eq.statement, eq.key) for eq in _EQUATIONS))
+
+# Full warnings of a statement where no equation could be checked
+_UNCHECKED_WARNINGS: Dict[str, Tuple[str, ...]] = {
+    stmt: tuple(dict.fromkeys(eq.if_missing for eq in eqs if eq.if_missing)) + _NO_EQUATION_WARNINGS[stmt]
+    for stmt, eqs in _EQUATIONS_BY_STATEMENT.items()
+}
+
+
+def _item_tags(aliases: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[str, ...]]:
+    """Every equation item mapped to the tags it is read from, in fallback order"""
+    return {
+        item: aliases.get(item, (item,))
+        for eq in _EQUATIONS
+        for item in (eq.left, *(term for _, term in eq.terms), *eq.optional)
+    }
+
+
+def _left_side_tags(aliases: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[str, ...]]:
+    """Per statement, every tag an equation's left side can come from"""
+    return {
+        stmt: tuple(dict.fromkeys(tag for eq in eqs for tag in aliases.get(eq.left, (eq.left,))))
+        for stmt, eqs in _EQUATIONS_BY_STATEMENT.items()
+    }
+
+
+def _equation_core(left: float, right: float, tau_rel: float,
+                   tau_abs: float) -> Tuple[bool, float]:
+    """
+    Arithmetic of one equation check: (valid, diff)
+
+    Valid if diff <= max(tau_rel * max(|left|, |right|), tau_abs): relative
+    tolerance for large amounts, an absolute floor for small ones, and
+    symmetric in left and right. The percentage is only needed for failures,
+    so EquationFailures.append derives it.
+    """
+    diff = fabs(left - right)
+    # The max() rule spelled out so the common passes short-circuit early
+    return (diff <= tau_abs or diff <= tau_rel * fabs(left) or diff <= tau_rel * fabs(right)), diff
+
+
+def _check_equation_vec(left: np.ndarray, right: np.ndarray, tau_rel: float,
+                        tau_abs: float) -> np.ndarray:
+    """_equation_core's valid flag, elementwise over arrays"""
+    diff = np.abs(left - right)
+    return diff <= np.maximum(tau_rel * np.maximum(np.abs(left), np.abs(right)), tau_abs)
+
+
+def _present(col: np.ndarray) -> np.ndarray:
+    """Array form of StatementValidator._resolve's test: not None and not NaN"""
+    return ~np.isnan(col)
+
+
+def _coalesce(*cols: np.ndarray) -> np.ndarray:
+    """
+    Array form of StatementValidator._resolve: first non-NaN column per row
+
+    Fills the NaN holes of a copy of the first column from each later column
+    in turn, so only the rows still missing are touched at each step.
+    """
+    if len(cols) == 1:
+        return cols[0]
+    out = cols[0].copy()
+    for col in cols[1:]:
+        mask = np.isnan(out)
+        out[mask] = col[mask]
+    return out
+
+
+# equations_failed of a result with no failures (shared, immutable)
+_NO_FAILURES: Tuple[()] = ()
+
+# Smallest row chunk worth handing to a batch worker thread
+_MIN_ROWS_PER_CHUNK = 4096
+
+
+# ValidationResult.__str__ layout
+_RESULT_TEMPLATE = """
+Validation Result: %s
+Statement Type: %s
+Equations Checked: %d
+Equations Passed: %d
+Equations Failed: %d
+Warnings: %d
+"""
+
+
+@dataclass(slots=True)
+class EquationFailures:
+    """
+    Failed equation checks of one validation, stored column-wise
+
+    One entry per failure across parallel columns (labels plus typed double
+    arrays) instead of one dict per failure. Iterating yields the familiar
+    failure dicts: {'equation', 'left', 'right', 'diff', 'diff_pct'}, with
+    'reason' in place of 'diff_pct' when the right side is zero.
+    """
+    equation: List[str] = field(default_factory=list)
+    left: array = field(default_factory=lambda: array('d'))
+    right: array = field(default_factory=lambda: array('d'))
+    diff: array = field(default_factory=lambda: array('d'))
+    diff_pct: array = field(default_factory=lambda: array('d'))  # NaN if right == 0
+
+    def append(self, equation: str, left: float, right: float, diff: float):
+        self.equation.append(equation)
+        self.left.append(left)
+        self.right.append(right)
+        self.diff.append(diff)
+        self.diff_pct.append(diff / fabs(right) * 100 if right != 0 else float('nan'))
+
+    def __len__(self) -> int:
+        return len(self.equation)
+
+    def iter_dicts(self) -> Iterator[Dict]:
+        """Failures as dicts, in check order"""
+        for i, equation in enumerate(self.equation):
+            error = {
+                'equation': equation,
+                'left': self.left[i],
+                'right': self.right[i],
+                'diff': self.diff[i]
+            }
+            if self.right[i] == 0:
+                error['reason'] = 'Right side is zero'
+            else:
+                error['diff_pct'] = self.diff_pct[i]
+            yield error
 
+    def __iter__(self) -> Iterator[Dict]:
+        return self.iter_dicts()
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
-    """Result of statement validation"""
+    """Result of statement validation (immutable; built once per validation)"""
     statement_type: str
     valid: bool
     equations_checked: List[str]
-    equations_passed: List[str]
-    equations_failed: List[Dict]
+    passed_mask: int                    # Bit i set if _ALL_EQUATIONS[i] passed
+    equations_failed: Union[EquationFailures, Tuple[()]]  # () if nothing failed
     warnings: List[str]
 
+    @property
+    def equations_passed(self) -> List[str]:
+        """Names of the passed equations, in check order"""
+        mask = self.passed_mask
+        return [name for name in _ALL_EQUATIONS if mask & _EQUATION_BITS[name]]
+
     def __str__(self):
-        status = "✅ VALID" if self.valid else "❌ INVALID"
-        return f"""
-Validation Result: {status}
-Statement Type: {self.statement_type}
-Equations Checked: {len(self.equations_checked)}
-Equations Passed: {len(self.equations_passed)}
-Equations Failed: {len(self.equations_failed)}
-Warnings: {len(self.warnings)}
-"""
+        return _RESULT_TEMPLATE % (
+            "✅ VALID" if self.valid else "❌ INVALID",
+            self.statement_type,
+            len(self.equations_checked),
+            self.passed_mask.bit_count(),
+            len(self.equations_failed),
+            len(self.warnings)
+        )
 
 
 class StatementValidator:
@@ -47,57 +344,191 @@ class StatementValidator:
         print(result)
     """
 
-    def __init__(self, tolerance_pct: float = 0.01):
+    __slots__ = ('tolerance_pct', 'tau_rel', 'tau_abs')
+
+    # Fallback chains for line items reported under different tags:
+    # the first tag present in the statement wins
+    _TAG_ALIASES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'revenue': (
+            'Revenues',
+            'RevenueFromContractWithCustomerExcludingAssessedTax',
+            'SalesRevenueNet',
+        ),
+        'cost_of_revenue': (
+            'CostOfRevenue',
+            'CostOfGoodsAndServicesSold',
+            'CostOfSales',
+        ),
+        'operating_income': (
+            'OperatingIncomeLoss',
+            'OperatingIncome',
+        ),
+        'income_before_tax': (
+            'IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest',
+            'IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments',
+            'IncomeLossBeforeIncomeTaxes',
+        ),
+        'tax_expense': (
+            'IncomeTaxExpenseBenefit',
+            'IncomeTaxesPaid',
+        ),
+        'net_income': (
+            'NetIncomeLoss',
+            'NetIncome',
+            'ProfitLoss',
+        ),
+        'operating_cf': (
+            'NetCashProvidedByUsedInOperatingActivities',
+            'NetCashProvidedByUsedInOperatingActivitiesContinuingOperations',
+        ),
+        'investing_cf': (
+            'NetCashProvidedByUsedInInvestingActivities',
+            'NetCashProvidedByUsedInInvestingActivitiesContinuingOperations',
+        ),
+        'financing_cf': (
+            'NetCashProvidedByUsedInFinancingActivities',
+            'NetCashProvidedByUsedInFinancingActivitiesContinuingOperations',
+        ),
+        'change_in_cash': (
+            'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsPeriodIncreaseDecreaseIncludingExchangeRateEffect',
+            'CashAndCashEquivalentsPeriodIncreaseDecrease',
+        ),
+        'beginning_cash': (
+            'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsBeginningOfPeriod',
+            'CashAndCashEquivalentsAtCarryingValueBeginningOfPeriod',
+        ),
+        'ending_cash': (
+            'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsEndOfPeriod',
+            'CashAndCashEquivalentsAtCarryingValue',
+        ),
+    }
+
+    # A statement with none of these tags cannot check any equation (every
+    # equation needs its left side), so it goes straight to the warnings
+    _REQUIRED_ANY: ClassVar[Dict[str, Tuple[str, ...]]] = _left_side_tags(_TAG_ALIASES)
+
+    # Tags of every equation item, in fallback order ((tag,) for plain tags)
+    _ITEM_TAGS: ClassVar[Dict[str, Tuple[str, ...]]] = _item_tags(_TAG_ALIASES)
+
+    def __init__(self, tolerance_pct: float = 0.01, tau_abs: float = 1000.0):
         """
         Initialize validator
 
+        An equation passes if |left - right| is within tolerance_pct of the
+        larger side, or within tau_abs, whichever is looser.
+
         Args:
             tolerance_pct: Acceptable difference percentage (default 0.01%)
+            tau_abs: Acceptable absolute difference for small amounts
+                     (default $1000 rounding)
         """
         self.tolerance_pct = tolerance_pct
+        self.tau_rel = tolerance_pct / 100
+        self.tau_abs = tau_abs
 
-    def _check_equation(self, left: float, right: float, equation: str) -> Tuple[bool, Optional[Dict]]:
+    @staticmethod
+    def _resolve(flat_data: Dict[str, float], keys: Tuple[str, ...]) -> Optional[float]:
         """
-        Check if left == right within tolerance
+        Value of the first of keys present in flat_data (None if none is)
 
-        Returns:
-            (is_valid, error_dict if invalid)
+        This is the one "missing" test of the scalar validators: a tag is
+        missing if absent, None or NaN (flat statements carry NaN for NUM rows
+        with a blank value), matching the NaN cells of the batch path. Every
+        item goes through here, so the equation gates only see None.
         """
-        if left is None or right is None:
-            return False, {
-                'equation': equation,
-                'reason': 'Missing values',
-                'left': left,
-                'right': right
-            }
+        for key in keys:
+            value = flat_data.get(key)
+            if value is not None and value == value:
+                return value
+        return None
+
+    def _value(self, flat_data: Dict[str, float], item: str) -> Optional[float]:
+        """Value of an equation item (a tag or a _TAG_ALIASES key)"""
+        return self._resolve(flat_data, self._ITEM_TAGS[item])
+
+    def _validate(self, statement: str, flat_data: Dict[str, float]) -> ValidationResult:
+        """
+        Check one statement's _EQUATIONS
 
-        diff = abs(left - right)
+        An equation is checked only if its left side and all its terms are
+        present; optional items count as 0 when missing. Items are resolved
+        as equations need them, each at most once per statement. A statement
+        without any _REQUIRED_ANY tag gets the unchecked warnings directly.
+        """
+        if flat_data.keys().isdisjoint(self._REQUIRED_ANY[statement]):
+            return ValidationResult(
+                statement_type=_STATEMENT_TYPES[statement],
+                valid=False,
+                equations_checked=[],
+                passed_mask=0,
+                equations_failed=_NO_FAILURES,
+                warnings=list(_UNCHECKED_WARNINGS[statement])
+            )
+
+        resolve = self._resolve
+        item_tags = self._ITEM_TAGS
+        values = {}
 
-        # Avoid division by zero
-        if right == 0:
-            if diff < 1000:  # Allow $1000 rounding for zero values
-                return True, None
+        def value(item: str) -> Optional[float]:
+            if item in values:
+                return values[item]
+            result = values[item] = resolve(flat_data, item_tags[item])
+            return result
+
+        equations_checked = []
+        passed_mask = 0
+        equations_failed = None
+        for eq in _EQUATIONS_BY_STATEMENT[statement]:
+            # An earlier alternative was checked
+            if eq.name in equations_checked:
+                continue
+
+            left = value(eq.left)
+            if left is None:
+                continue
+            right = None
+            for sign, item in eq.terms:
+                term = value(item)
+                if term is None:
+                    right = None
+                    break
+                if right is None:
+                    right = term
+                elif sign > 0:
+                    right = right + term
+                else:
+                    right = right - term
+            if right is None:
+                continue
+            for item in eq.optional:
+                term = value(item)
+                if term is not None:
+                    right = right + term
+
+            equations_checked.append(eq.name)
+            valid, diff = _equation_core(left, right, self.tau_rel, self.tau_abs)
+            if valid:
+                passed_mask |= _EQUATION_BITS[eq.name]
             else:
-                return False, {
-                    'equation': equation,
-                    'left': left,
-                    'right': right,
-                    'diff': diff,
-                    'reason': 'Right side is zero'
-                }
-
-        diff_pct = (diff / abs(right)) * 100
-
-        if diff_pct <= self.tolerance_pct:
-            return True, None
-        else:
-            return False, {
-                'equation': equation,
-                'left': left,
-                'right': right,
-                'diff': diff,
-                'diff_pct': diff_pct
-            }
+                if equations_failed is None:
+                    equations_failed = EquationFailures()
+                equations_failed.append(eq.label, left, right, diff)
+
+        warnings = []
+        for eq in _EQUATIONS_BY_STATEMENT[statement]:
+            if eq.if_missing and eq.name not in equations_checked and eq.if_missing not in warnings:
+                warnings.append(eq.if_missing)
+        if not equations_checked:
+            warnings.extend(_NO_EQUATION_WARNINGS[statement])
+
+        return ValidationResult(
+            statement_type=_STATEMENT_TYPES[statement],
+            valid=equations_failed is None and len(equations_checked) > 0,
+            equations_checked=equations_checked,
+            passed_mask=passed_mask,
+            equations_failed=equations_failed if equations_failed is not None else _NO_FAILURES,
+            warnings=warnings
+        )
 
     def validate_balance_sheet(self, flat_data: Dict[str, float]) -> ValidationResult:
         """
@@ -114,83 +545,7 @@ class StatementValidator:
         Returns:
             ValidationResult
         """
-        equations_checked = []
-        equations_passed = []
-        equations_failed = []
-        warnings = []
-
-        # Main equation: Assets = Liabilities + Equity
-        assets = flat_data.get('Assets')
-        liabilities = flat_data.get('Liabilities')
-        equity = flat_data.get('StockholdersEquity')
-        liab_and_equity = flat_data.get('LiabilitiesAndStockholdersEquity')
-
-        if assets and liab_and_equity:
-            equations_checked.append('Assets = Liabilities + Equity')
-            valid, error = self._check_equation(
-                assets,
-                liab_and_equity,
-                'Assets = LiabilitiesAndStockholdersEquity'
-            )
-            if valid:
-                equations_passed.append('Assets = Liabilities + Equity')
-            else:
-                equations_failed.append(error)
-
-        elif assets and liabilities and equity:
-            equations_checked.append('Assets = Liabilities + Equity')
-            valid, error = self._check_equation(
-                assets,
-                liabilities + equity,
-                'Assets = Liabilities + StockholdersEquity'
-            )
-            if valid:
-                equations_passed.append('Assets = Liabilities + Equity')
-            else:
-                equations_failed.append(error)
-        else:
-            warnings.append('Cannot validate main equation: missing Assets, Liabilities, or Equity')
-
-        # Check: Total Assets = Current Assets + Noncurrent Assets
-        current_assets = flat_data.get('AssetsCurrent')
-        noncurrent_assets = flat_data.get('AssetsNoncurrent')
-
-        if assets and current_assets and noncurrent_assets:
-            equations_checked.append('Assets = Current + Noncurrent')
-            valid, error = self._check_equation(
-                assets,
-                current_assets + noncurrent_assets,
-                'Assets = AssetsCurrent + AssetsNoncurrent'
-            )
-            if valid:
-                equations_passed.append('Assets = Current + Noncurrent')
-            else:
-                equations_failed.append(error)
-
-        # Check: Total Liabilities = Current Liabilities + Noncurrent Liabilities
-        current_liab = flat_data.get('LiabilitiesCurrent')
-        noncurrent_liab = flat_data.get('LiabilitiesNoncurrent')
-
-        if liabilities and current_liab and noncurrent_liab:
-            equations_checked.append('Liabilities = Current + Noncurrent')
-            valid, error = self._check_equation(
-                liabilities,
-                current_liab + noncurrent_liab,
-                'Liabilities = LiabilitiesCurrent + LiabilitiesNoncurrent'
-            )
-            if valid:
-                equations_passed.append('Liabilities = Current + Noncurrent')
-            else:
-                equations_failed.append(error)
-
-        return ValidationResult(
-            statement_type='Balance Sheet',
-            valid=(len(equations_failed) == 0 and len(equations_checked) > 0),
-            equations_checked=equations_checked,
-            equations_passed=equations_passed,
-            equations_failed=equations_failed,
-            warnings=warnings
-        )
+        return self._validate('BS', flat_data)
 
     def validate_income_statement(self, flat_data: Dict[str, float]) -> ValidationResult:
         """
@@ -207,93 +562,7 @@ class StatementValidator:
         Returns:
             ValidationResult
         """
-        equations_checked = []
-        equations_passed = []
-        equations_failed = []
-        warnings = []
-
-        # Get common income statement tags (with variations)
-        revenue = (flat_data.get('Revenues') or
-                  flat_data.get('RevenueFromContractWithCustomerExcludingAssessedTax') or
-                  flat_data.get('SalesRevenueNet'))
-
-        cost_of_revenue = (flat_data.get('CostOfRevenue') or
-                          flat_data.get('CostOfGoodsAndServicesSold') or
-                          flat_data.get('CostOfSales'))
-
-        gross_profit = flat_data.get('GrossProfit')
-
-        operating_income = (flat_data.get('OperatingIncomeLoss') or
-                           flat_data.get('OperatingIncome'))
-
-        operating_expenses = flat_data.get('OperatingExpenses')
-
-        income_before_tax = (flat_data.get('IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest') or
-                            flat_data.get('IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments') or
-                            flat_data.get('IncomeLossBeforeIncomeTaxes'))
-
-        tax_expense = (flat_data.get('IncomeTaxExpenseBenefit') or
-                      flat_data.get('IncomeTaxesPaid'))
-
-        net_income = (flat_data.get('NetIncomeLoss') or
-                     flat_data.get('NetIncome') or
-                     flat_data.get('ProfitLoss'))
-
-        # Check: Gross Profit = Revenue - Cost of Revenue
-        if revenue and cost_of_revenue and gross_profit:
-            equations_checked.append('Gross Profit = Revenue - Cost of Revenue')
-            valid, error = self._check_equation(
-                gross_profit,
-                revenue - cost_of_revenue,
-                'GrossProfit = Revenue - CostOfRevenue'
-            )
-            if valid:
-                equations_passed.append('Gross Profit = Revenue - Cost of Revenue')
-            else:
-                equations_failed.append(error)
-
-        # Check: Operating Income = Gross Profit - Operating Expenses
-        if gross_profit and operating_expenses and operating_income:
-            equations_checked.append('Operating Income = Gross Profit - Operating Expenses')
-            valid, error = self._check_equation(
-                operating_income,
-                gross_profit - operating_expenses,
-                'OperatingIncome = GrossProfit - OperatingExpenses'
-            )
-            if valid:
-                equations_passed.append('Operating Income = Gross Profit - Operating Expenses')
-            else:
-                equations_failed.append(error)
-
-        # Check: Net Income = Income Before Tax - Tax Expense
-        if income_before_tax and tax_expense and net_income:
-            equations_checked.append('Net Income = Income Before Tax - Tax')
-
-            # Handle equity method adjustments
-            equity_method = flat_data.get('IncomeLossFromEquityMethodInvestments', 0)
-
-            valid, error = self._check_equation(
-                net_income,
-                income_before_tax - tax_expense + equity_method,
-                'NetIncome = IncomeTax - Tax + EquityMethod'
-            )
-            if valid:
-                equations_passed.append('Net Income = Income Before Tax - Tax')
-            else:
-                equations_failed.append(error)
-
-        if len(equations_checked) == 0:
-            warnings.append('Cannot validate income statement: missing required tags')
-            warnings.append('Looking for: Revenue, Cost of Revenue, Operating Income, Net Income')
-
-        return ValidationResult(
-            statement_type='Income Statement',
-            valid=(len(equations_failed) == 0 and len(equations_checked) > 0),
-            equations_checked=equations_checked,
-            equations_passed=equations_passed,
-            equations_failed=equations_failed,
-            warnings=warnings
-        )
+        return self._validate('IS', flat_data)
 
     def validate_cash_flow_statement(self, flat_data: Dict[str, float]) -> ValidationResult:
         """
@@ -310,76 +579,171 @@ class StatementValidator:
         Returns:
             ValidationResult
         """
-        equations_checked = []
-        equations_passed = []
-        equations_failed = []
-        warnings = []
+        return self._validate('CF', flat_data)
 
-        # Get cash flow components
-        operating_cf = (flat_data.get('NetCashProvidedByUsedInOperatingActivities') or
-                       flat_data.get('NetCashProvidedByUsedInOperatingActivitiesContinuingOperations'))
+    @staticmethod
+    def _tag_matrix(filings: Union[Sequence[Dict[str, float]], pd.DataFrame]) -> np.ndarray:
+        """
+        (filings x _TAG_COLUMNS) float array, NaN where a tag is missing
 
-        investing_cf = (flat_data.get('NetCashProvidedByUsedInInvestingActivities') or
-                       flat_data.get('NetCashProvidedByUsedInInvestingActivitiesContinuingOperations'))
+        A DataFrame is used as is (one row per filing, one column per tag);
+        callers that load only _TAG_COLUMNS avoid the reindex copy. Dicts are
+        read for _TAG_COLUMNS only: flat statements carry many company-specific
+        tags, and building the union of those first grows quadratically.
+        """
+        if isinstance(filings, pd.DataFrame):
+            df = filings
+            if tuple(df.columns) != _TAG_COLUMNS:
+                df = df.reindex(columns=_TAG_COLUMNS)
+        else:
+            df = pd.DataFrame.from_records(list(filings), columns=list(_TAG_COLUMNS))
+        return df.to_numpy(dtype=np.float64, na_value=np.nan)
 
-        financing_cf = (flat_data.get('NetCashProvidedByUsedInFinancingActivities') or
-                       flat_data.get('NetCashProvidedByUsedInFinancingActivitiesContinuingOperations'))
+    def validate_all_statements_batch(self, filings: Union[Sequence[Dict[str, float]], pd.DataFrame],
+                                      workers: Optional[int] = None) -> np.recarray:
+        """
+        Validate many filings at once with array arithmetic
 
-        change_in_cash = (flat_data.get('CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsPeriodIncreaseDecreaseIncludingExchangeRateEffect') or
-                         flat_data.get('CashAndCashEquivalentsPeriodIncreaseDecrease'))
+        Each filing is one tag->value dict holding all three statements (e.g.
+        {**bs_flat, **is_flat, **cf_flat}); no tag is read by more than one
+        validator. A DataFrame with one row per filing and one column per tag
+        is accepted as well. Values go into a (filings x _TAG_COLUMNS) float
+        array with NaN for missing tags, and every equation is then evaluated
+        for all filings with numpy ops, gated like the per-statement
+        validators.
 
-        fx_effect = flat_data.get('EffectOfExchangeRateOnCashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents', 0)
+        Args:
+            filings: Filing dicts, or a DataFrame of them
+            workers: Threads evaluating row chunks in parallel (default: one;
+                     numpy releases the GIL inside the array ops)
 
-        beginning_cash = (flat_data.get('CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsBeginningOfPeriod') or
-                         flat_data.get('CashAndCashEquivalentsAtCarryingValueBeginningOfPeriod'))
+        Returns:
+            Record array, one row per filing, with for each name in
+            BATCH_EQUATIONS a '<name>_checked' and a '<name>_passed' bool
+            field, plus 'BS_valid', 'IS_valid' and 'CF_valid'
+        """
+        checked, passed, _ = self._evaluate_chunked(self._tag_matrix(filings), workers=workers)
+
+        # Same rule as ValidationResult.valid: something checked, nothing failed
+        arrays = []
+        names = []
+        for _, name in BATCH_EQUATIONS:
+            arrays += [checked[name], passed[name]]
+            names += [f'{name}_checked', f'{name}_passed']
+        for stmt in ('BS', 'IS', 'CF'):
+            stmt_names = [name for s, name in BATCH_EQUATIONS if s == stmt]
+            any_checked = np.logical_or.reduce([checked[name] for name in stmt_names])
+            any_failed = np.logical_or.reduce([checked[name] & ~passed[name] for name in stmt_names])
+            arrays.append(any_checked & ~any_failed)
+            names.append(f'{stmt}_valid')
+
+        return np.rec.fromarrays(arrays, names=names)
+
+    def validate_from_dataframe(self, df: pd.DataFrame, workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Validate a frame of filings without going through per-row dicts
 
-        ending_cash = (flat_data.get('CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsEndOfPeriod') or
-                      flat_data.get('CashAndCashEquivalentsAtCarryingValue'))
+        Args:
+            df: One row per filing (the index identifies it), one column per
+                tag; columns outside _TAG_COLUMNS are ignored
+            workers: Threads evaluating row chunks in parallel (default: one)
 
-        # Check: Operating + Investing + Financing (+FX) = Change in Cash
-        if operating_cf is not None and investing_cf is not None and financing_cf is not None and change_in_cash is not None:
-            equations_checked.append('Operating + Investing + Financing = Change in Cash')
+        Returns:
+            Long frame indexed by 'filing_id' with one row per checked
+            (filing, equation): columns 'equation' (a BATCH_EQUATIONS name),
+            'valid' and 'diff_pct' (NaN when the right side is zero)
+        """
+        checked, passed, diff_pct = self._evaluate_chunked(self._tag_matrix(df), with_diff_pct=True,
+                                                           workers=workers)
+
+        names = [name for _, name in BATCH_EQUATIONS]
+        # (filings x equations), walked row-major so rows come grouped by filing
+        checked_mat = np.column_stack([checked[name] for name in names])
+        rows, eqs = np.nonzero(checked_mat)
+        return pd.DataFrame(
+            {
+                'equation': np.asarray(names, dtype=object)[eqs],
+                'valid': np.column_stack([passed[name] for name in names])[rows, eqs],
+                'diff_pct': np.column_stack([diff_pct[name] for name in names])[rows, eqs],
+            },
+            index=pd.Index(df.index[rows], name='filing_id')
+        )
 
-            calculated_change = operating_cf + investing_cf + financing_cf
-            if fx_effect != 0:
-                calculated_change += fx_effect
+    def _evaluate_chunked(self, data: np.ndarray, with_diff_pct: bool = False,
+                          workers: Optional[int] = None
+                          ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """
+        _evaluate_batch over row chunks on a thread pool
 
-            valid, error = self._check_equation(
-                change_in_cash,
-                calculated_change,
-                'ChangeInCash = Operating + Investing + Financing + FX'
-            )
-            if valid:
-                equations_passed.append('Operating + Investing + Financing = Change in Cash')
-            else:
-                equations_failed.append(error)
-
-        # Check: Beginning Cash + Change = Ending Cash
-        if beginning_cash is not None and change_in_cash is not None and ending_cash is not None:
-            equations_checked.append('Beginning Cash + Change = Ending Cash')
-            valid, error = self._check_equation(
-                ending_cash,
-                beginning_cash + change_in_cash,
-                'EndingCash = BeginningCash + Change'
-            )
-            if valid:
-                equations_passed.append('Beginning Cash + Change = Ending Cash')
-            else:
-                equations_failed.append(error)
+        Filings are independent, so each chunk is evaluated on its own and
+        the per-equation arrays are concatenated back in row order. Falls back
+        to a single call for one worker or when chunks would be too small.
+        """
+        n_chunks = min(workers or 1, len(data) // _MIN_ROWS_PER_CHUNK)
+        if n_chunks <= 1:
+            return self._evaluate_batch(data, with_diff_pct)
 
-        if len(equations_checked) == 0:
-            warnings.append('Cannot validate cash flow statement: missing required tags')
-            warnings.append('Looking for: Operating CF, Investing CF, Financing CF, Change in Cash')
+        with ThreadPoolExecutor(max_workers=n_chunks) as pool:
+            parts = list(pool.map(lambda chunk: self._evaluate_batch(chunk, with_diff_pct),
+                                  np.array_split(data, n_chunks)))
 
-        return ValidationResult(
-            statement_type='Cash Flow Statement',
-            valid=(len(equations_failed) == 0 and len(equations_checked) > 0),
-            equations_checked=equations_checked,
-            equations_passed=equations_passed,
-            equations_failed=equations_failed,
-            warnings=warnings
+        return tuple(
+            {key: np.concatenate([part[i][key] for part in parts]) for key in parts[0][i]}
+            for i in range(3)
         )
 
+    def _evaluate_batch(self, data: np.ndarray, with_diff_pct: bool = False
+                        ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """
+        Evaluate _EQUATIONS over a _tag_matrix, gated like _validate
+
+        Returns:
+            (checked, passed, diff_pct), each {BATCH_EQUATIONS name: array with
+            one entry per filing}; diff_pct is only filled (NaN where unchecked
+            or the right side is zero) if with_diff_pct is set, else empty
+        """
+        tag_index = _TAG_INDEX
+
+        def col(tag: str) -> np.ndarray:
+            return data[:, tag_index[tag]]
+
+        item_cols = {}
+
+        def item_col(item: str) -> np.ndarray:
+            if item not in item_cols:
+                item_cols[item] = _coalesce(*(col(tag) for tag in self._TAG_ALIASES.get(item) or (item,)))
+            return item_cols[item]
+
+        n = len(data)
+        checked = {key: np.zeros(n, dtype=bool) for _, key in BATCH_EQUATIONS}
+        passed = {key: np.zeros(n, dtype=bool) for _, key in BATCH_EQUATIONS}
+        diff_pct = {key: np.full(n, np.nan) for _, key in BATCH_EQUATIONS} if with_diff_pct else {}
+
+        for eq in _EQUATIONS:
+            left = item_col(eq.left)
+            # Rows where an earlier alternative was checked are skipped
+            gate = _present(left) & ~checked[eq.key]
+            right = None
+            for sign, item in eq.terms:
+                value = item_col(item)
+                gate &= _present(value)
+                if right is None:
+                    right = value
+                elif sign > 0:
+                    right = right + value
+                else:
+                    right = right - value
+            for item in eq.optional:
+                right = right + np.nan_to_num(item_col(item), nan=0.0)
+
+            checked[eq.key] |= gate
+            passed[eq.key] |= gate & _check_equation_vec(left, right, self.tau_rel, self.tau_abs)
+            if with_diff_pct:
+                rows = gate & (right != 0)
+                diff_pct[eq.key][rows] = np.abs(left[rows] - right[rows]) / np.abs(right[rows]) * 100
+
+        return checked, passed, diff_pct
+
     def validate_all_statements(self, balance_sheet: Dict[str, float],
                                income_statement: Dict[str, float],
                                cash_flow: Dict[str, float]) -> Dict[str, ValidationResult]:
@@ -390,9 +754,9 @@ class StatementValidator:
             Dict with 'BS', 'IS', 'CF' keys containing ValidationResults
         """
         return {
-            'BS': self.validate_balance_sheet(balance_sheet),
-            'IS': self.validate_income_statement(income_statement),
-            'CF': self.validate_cash_flow_statement(cash_flow)
+            'BS': self._validate('BS', balance_sheet),
+            'IS': self._validate('IS', income_statement),
+            'CF': self._validate('CF', cash_flow)
         }
 
 
@@ -33,6 +33,7 @@ Date: November 2025
 
 import sys
 import argparse
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Tuple, Dict
@@ -213,6 +214,51 @@ class DatasetSynchronizer:
 
         return missing
 
+    def _record_download(self, year: int, quarter: int, future: Future, results: Dict) -> bool:
+        """
+        Report a finished download and update results
+
+        Returns:
+            True if the quarter is ready to be indexed
+        """
+        try:
+            download_result = future.result()
+        except Exception as e:
+            print(f"  ❌ {year}Q{quarter} download error: {e}")
+            results['failed'].append((year, quarter, 'download', str(e)))
+            return False
+
+        if download_result.success:
+            print(f"  ✅ {year}Q{quarter} downloaded ({download_result.zip_size_mb:.1f} MB)")
+            results['downloaded'] += 1
+            return True
+
+        error_msg = download_result.error or "Unknown error"
+        print(f"  ⚠️  {year}Q{quarter} download skipped or failed: {error_msg}")
+        if "not found" in error_msg.lower() or "404" in error_msg:
+            print(f"      This quarter may not be released yet")
+        else:
+            results['failed'].append((year, quarter, 'download', error_msg))
+        return False
+
+    def _record_index(self, year: int, quarter: int, future: Future, results: Dict):
+        """Report a finished indexing run and update results"""
+        try:
+            index_result = future.result()
+        except Exception as e:
+            print(f"  ❌ {year}Q{quarter} indexing error: {e}")
+            results['failed'].append((year, quarter, 'index', str(e)))
+            return
+
+        if index_result and isinstance(index_result, dict):
+            companies = index_result.get('companies', {}).get('upserted', 0)
+            filings = index_result.get('filings', {}).get('inserted', 0)
+            print(f"  ✅ {year}Q{quarter} indexed ({companies:,} companies, {filings:,} filings)")
+            results['indexed'] += 1
+        else:
+            # Already indexed or no data - not a failure
+            print(f"  ⚠️  {year}Q{quarter} already indexed or no data")
+
     def sync(self, dry_run: bool = False, force_latest: bool = False,
             update_tickers: bool = False) -> Dict:
         """
@@ -310,50 +356,40 @@ class DatasetSynchronizer:
             'success': True
         }
 
-        for i, (year, quarter) in enumerate(missing, 1):
-            print(f"\n[{i}/{len(missing)}] Processing {year}Q{quarter}...")
-
-            # Download
-            try:
-                print(f"  Downloading...")
-                download_result = self.downloader.download_quarter(year, quarter, force=False)
-
-                if download_result.success:
-                    print(f"  ✅ Downloaded ({download_result.zip_size_mb:.1f} MB)")
-                    results['downloaded'] += 1
-                else:
-                    error_msg = download_result.error or "Unknown error"
-                    print(f"  ⚠️  Download skipped or failed: {error_msg}")
-                    if "not found" in error_msg.lower() or "404" in error_msg:
-                        print(f"      This quarter may not be released yet")
-                        continue
-                    else:
-                        results['failed'].append((year, quarter, 'download', error_msg))
-                        continue
-
-            except Exception as e:
-                print(f"  ❌ Download error: {e}")
-                results['failed'].append((year, quarter, 'download', str(e)))
-                continue
-
-            # Index
-            try:
-                print(f"  Indexing...")
-                index_result = self.indexer.index_quarter(year, quarter, force=False)
-
-                if index_result and isinstance(index_result, dict):
-                    companies = index_result.get('companies', {}).get('upserted', 0)
-                    filings = index_result.get('filings', {}).get('inserted', 0)
-                    print(f"  ✅ Indexed ({companies:,} companies, {filings:,} filings)")
-                    results['indexed'] += 1
-                else:
-                    # Already indexed or no data
-                    print(f"  ⚠️  Already indexed or no data")
-                    # Don't count as failure if it's already indexed
-
-            except Exception as e:
-                print(f"  ❌ Indexing error: {e}")
-                results['failed'].append((year, quarter, 'index', str(e)))
+        # Downloads run concurrently and indexing overlaps them, but quarters
+        # are indexed one at a time in chronological order: the companies
+        # upsert is not safe to run concurrently, and later quarters must
+        # win company_name updates. A single index worker runs them in the
+        # order they are submitted.
+        download_workers = min(self.downloader.processing.concurrent_downloads, len(missing))
+        with ThreadPoolExecutor(max_workers=download_workers) as dl_pool, \
+                ThreadPoolExecutor(max_workers=1) as idx_pool:
+            download_futures = {
+                dl_pool.submit(self.downloader.download_quarter, year, quarter, force=False): (year, quarter)
+                for year, quarter in missing
+            }
+            print(f"Downloading with {download_workers} workers, indexing in quarter order")
+
+            # True once a quarter is downloaded, False if it was skipped/failed;
+            # next_quarter walks missing (chronological) as quarters settle
+            ready = {}
+            next_quarter = 0
+            index_futures = []
+            for i, future in enumerate(as_completed(download_futures), 1):
+                year, quarter = download_futures[future]
+                print(f"\n[{i}/{len(missing)}] {year}Q{quarter}")
+                ready[(year, quarter)] = self._record_download(year, quarter, future, results)
+
+                while next_quarter < len(missing) and missing[next_quarter] in ready:
+                    year, quarter = missing[next_quarter]
+                    next_quarter += 1
+                    if ready[(year, quarter)]:
+                        index_future = idx_pool.submit(self.indexer.index_quarter, year, quarter,
+                                                       force=False, bulk_mode=True)
+                        index_futures.append((year, quarter, index_future))
+
+            for year, quarter, future in index_futures:
+                self._record_index(year, quarter, future, results)
 
         # Update tickers if requested
         if update_tickers and results['indexed'] > 0:
@@ -23,6 +23,7 @@ Usage:
     # [('AssetsCurrent', 1.0), ('AssetsNoncurrent', 1.0)]
 """
 
+import functools
 import requests
 import xml.etree.ElementTree as ET
 from pathlib import Path
@@ -585,6 +586,25 @@ def load_calc_graph_with_fallback(cik: int, adsh: str, cache_dir: Path = None, v
     """
     cache_dir = cache_dir or DEFAULT_CACHE_DIR
 
+    # Reconstructing BS, IS and CF of one filing asks for the same graph
+    # three times; only the first call touches disk/network. The copy keeps
+    # callers from adding or removing keys in the cached graph; the children
+    # are frozen tuples, shared by every caller.
+    calc_graph, source = _load_calc_graph_cached(cik, adsh, cache_dir, verbose)
+    return dict(calc_graph), source
+
+
+@functools.lru_cache(maxsize=256)
+def _load_calc_graph_cached(cik: int, adsh: str, cache_dir: Path,
+                            verbose: bool) -> Tuple[Dict[str, Tuple[Tuple[str, float], ...]], str]:
+    """Fallback chain behind load_calc_graph_with_fallback, memoized per filing"""
+    calc_graph, source = _load_calc_graph_uncached(cik, adsh, cache_dir, verbose)
+    return {parent: tuple(children) for parent, children in calc_graph.items()}, source
+
+
+def _load_calc_graph_uncached(cik: int, adsh: str, cache_dir: Path,
+                              verbose: bool) -> Tuple[Dict[str, List[Tuple[str, float]]], str]:
+    """The fallback chain itself: filing linkbase, schema, then US-GAAP"""
     # Try 1: Filing-specific calc linkbase (_cal.xml)
     try:
         calc_graph = load_calc_graph(cik, adsh, cache_dir)